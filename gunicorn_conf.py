@@ -0,0 +1,20 @@
+"""Gunicorn settings for running the FastAPI app in production.
+
+Run with: gunicorn -c gunicorn_conf.py main:app
+
+The service is I/O-bound (LLM streams, Google APIs), so it runs asyncio Uvicorn
+workers rather than gevent; uvicorn[standard] gives them uvloop and httptools.
+"""
+
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+worker_class = "uvicorn.workers.UvicornWorker"
+# Chat history, chat jobs, the response cache and the per-token tool caches live in process
+# memory, so a second worker would answer /chat/jobs/{id} with 404 and lose session context.
+# Only raise WEB_CONCURRENCY behind sticky routing.
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+# Reasoning and web search responses can stream for well over a minute
+timeout = 120
+keepalive = 30
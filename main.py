@@ -1,26 +1,51 @@
+from dotenv import load_dotenv
+
+# Load .env before the app modules, which read their settings at import time
+load_dotenv()
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from dotenv import load_dotenv
 from src.api.endpoints import chat
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
+from contextlib import asynccontextmanager
+from src.utils.http_client import close_async_client, warm_up_connection
+from src.utils.streaming import StreamingGZipMiddleware
 import logging
-import sys
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+import logging.config
+import os
+
+# Configure logging once, at the entry point
+logging.config.dictConfig({
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "default": {"format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s"},
+    },
+    "handlers": {
+        "stdout": {
+            "class": "logging.StreamHandler",
+            "formatter": "default",
+            "stream": "ext://sys.stdout",
+        },
+    },
+    "root": {"level": "INFO", "handlers": ["stdout"]},
+})
 
 logger = logging.getLogger(__name__)
 
-load_dotenv()
+AZURE_OPENAI_ENDPOINT = os.getenv("AZURE_OPENAI_ENDPOINT")
+
 logger.info("Environment variables loaded")
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await warm_up_connection(AZURE_OPENAI_ENDPOINT)
+    yield
+    await close_async_client()
+    logger.info("Shared HTTP client closed")
+
+# JSON endpoints serialize with orjson instead of the stdlib encoder
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 logger.info("FastAPI application initialized")
 
 # CORS middleware configuration
@@ -33,15 +58,21 @@ app.add_middleware(
 )
 logger.info("CORS middleware configured")
 
+# Compress JSON responses such as /chat/batch; text/event-stream chat responses are skipped
+app.add_middleware(StreamingGZipMiddleware, minimum_size=1024)
+
+# Static status payload, built once instead of on every health check
+ROOT_STATUS = {
+    "status": "running",
+    "message": "AI Agent is running...",
+    "environment": "development",
+    "version": "1.0.0"
+}
+
 @app.get("/")
 def root():
     logger.info("Root endpoint called")
-    return {
-        "status": "running",
-        "message": "AI Agent is running...",
-        "environment": "development",
-        "version": "1.0.0"
-    }
+    return ROOT_STATUS
 
 @app.get("/test")
 def index():
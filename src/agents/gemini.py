@@ -11,9 +11,6 @@ from datetime import datetime, timedelta
 from fastapi import HTTPException
 from fastapi.responses import StreamingResponse
 
-from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain.callbacks import AsyncIteratorCallbackHandler
-from langchain.agents import initialize_agent, AgentType
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.schema import HumanMessage
 
@@ -23,14 +20,81 @@ from src.tools.google.get_tasks_tool import GetTasksTool
 from src.tools.google.get_events_tool import GetEventsTool
 from src.utils.gemini_streaming import BaseGeminiStreaming
 from src.utils.prompts import initialize_prompts
-from src.utils.task_utils import prepare_task_data, format_task_details
-from src.utils.event_utils import prepare_event_data, format_event_details
-from src.utils.time_utils import parse_date_from_text, parse_time_range, format_task_date
+from src.utils.stream_cache import StreamCache
+from src.utils.chat_history import chat_history
+from src.utils.streaming import aclosing, REASONING_START, FINAL_ANSWER_START, split_reasoning_stream, streaming_response
+from src.utils.task_utils import prepare_task_data, format_task_details, format_task_line
+from src.utils.event_utils import prepare_event_data, format_event_details, format_event_line
+from src.utils.time_utils import parse_date_from_text, parse_time_range
 from src.utils.prompt.task_prompts import get_task_analysis_prompt
 from src.utils.prompt.event_prompts import get_event_analysis_prompt
 
 logger = logging.getLogger(__name__)
 
+# Finished plain-chat responses shared across requests
+_stream_cache = StreamCache(maxsize=2048, ttl=300.0)
+
+def _keyword_pattern(keywords: List[str]) -> re.Pattern:
+    """Compile a keyword list into one alternation that matches any of them as a substring."""
+    return re.compile("|".join(re.escape(keyword) for keyword in keywords))
+
+# Intent keywords, matched against the lowercased request
+TODAY_RE = _keyword_pattern(["today", "today's", "for today"])
+TOMORROW_RE = _keyword_pattern(["tomorrow", "tomorrow's", "for tomorrow"])
+UPCOMING_RE = _keyword_pattern(["upcoming", "next", "coming", "future"])
+
+RETRIEVAL_PHRASE_RE = _keyword_pattern([
+    "show my", "show all", "list my", "show me", "get my", "what are my", 
+    "all my", "my all", "all the", "see my", "view my", "check my"
+])
+
+GET_TASK_RE = _keyword_pattern([
+    "show tasks", "list out my tasks", "get tasks", "list tasks", "view tasks", "what are my tasks", 
+    "show my tasks", "display tasks", "check tasks", "list my tasks", "show my tasks", "check my tasks"
+])
+TIME_SPECIFIC_TASK_RE = _keyword_pattern([
+    "tomorrow's tasks", "tomorrow tasks", "tasks for tomorrow", 
+    "today's tasks", "today tasks", "tasks for today",
+    "upcoming tasks", "next tasks", "show me my"
+])
+
+GET_EVENT_RE = _keyword_pattern([
+    "show events", "list events", "get events", "view events", "what are my events",
+    "show my events", "display events", "check events", "list my events", "show meetings",
+    "list meetings", "show my meetings", "check my calendar", "view calendar", "calendar events",
+    "show all meetings", "show my all meetings", "show all my meetings", "show my all the meetings",
+    "all meetings", "all events", "all my meetings", "all my events", "all of my meetings", 
+    "all of my events", "meetings", "my meetings"
+])
+TIME_SPECIFIC_EVENT_RE = _keyword_pattern([
+    "tomorrow's events", "tomorrow events", "events for tomorrow",
+    "today's events", "today events", "events for today",
+    "upcoming events", "next events", "show me my events",
+    "tomorrow's meetings", "today's meetings", "upcoming meetings"
+])
+
+GET_BOTH_RE = _keyword_pattern([
+    "show my schedule", "show my today schedule", "show my tomorrow schedule", "what's on my schedule", "check my schedule",
+    "what do i have", "view my schedule", "list everything", "show everything",
+    "all tasks and events", "all events and tasks", "my agenda", "what's on my agenda"
+])
+
+# Creation keywords (retrieval is detected first)
+EVENT_RE = _keyword_pattern([
+    "meeting", "schedule meeting", "create meeting", "set meeting", 
+    "event", "create event", "set event", "calendar event",
+    "appointment", "schedule", "interview", "call", "conference",
+    "webinar", "session", "catch up", "sync", "discussion"
+])
+TASK_RE = _keyword_pattern([
+    "reminder", "remind me", "create task", "set task", "set reminder", 
+    "create reminder", "todo", "task"
+])
+
+# Bare one-word requests treated as "show me my ..."
+AMBIGUOUS_EVENT_QUERIES = frozenset({"meetings", "events"})
+AMBIGUOUS_QUERIES = AMBIGUOUS_EVENT_QUERIES | {"tasks"}
+
 class GeminiAgent(BaseGeminiStreaming):
     """Gemini Agent with task management capabilities."""
 
@@ -39,6 +103,7 @@ class GeminiAgent(BaseGeminiStreaming):
         self.websearch = websearch
         self.reasoning = reasoning
         self.google_access_token = google_access_token
+        self.session_id: Optional[str] = None
         
         # Initialize tools
         self.tools = []
@@ -46,30 +111,16 @@ class GeminiAgent(BaseGeminiStreaming):
         # Add task and event tools if access token is provided
         if google_access_token:
             self.tools.extend([
-                CreateTaskTool(google_access_token),
-                CreateEventTool(google_access_token),
+                CreateTaskTool.get_instance(google_access_token),
+                CreateEventTool.get_instance(google_access_token),
                 GetTasksTool(google_access_token),
                 GetEventsTool(google_access_token)
             ])
             logger.info("Task and event tools initialized successfully")
         
-        # Initialize agent if tools are available
-        if self.tools:
-            logger.info(f"Initializing agent with {len(self.tools)} tools")
-            
-            # Get task management prompt
-            _, _, _, task_management_prompt = initialize_prompts()
-            
-            self.agent = initialize_agent(
-                tools=self.tools,
-                llm=self.llm,
-                agent=AgentType.STRUCTURED_CHAT_ZERO_SHOT_REACT_DESCRIPTION,
-                agent_kwargs={"prompt": task_management_prompt},
-                verbose=True
-            )
-            logger.info("Agent initialization complete")
-        else:
-            logger.warning("No tools available for agent")
+        # Task and event requests are routed to the tools directly, so no agent is built here
+        if not self.tools:
+            logger.warning("No Google tools available, answering chat directly")
     
     def _extract_task_data_from_response(self, response: str) -> List[Dict[str, Any]]:
         """Extract task creation data from response text."""
@@ -149,11 +200,8 @@ class GeminiAgent(BaseGeminiStreaming):
             content_lower = content.lower()
             
             # Determine time period
-            today_keywords = ["today", "today's", "for today"]
-            tomorrow_keywords = ["tomorrow", "tomorrow's", "for tomorrow"]
-            
-            today_only = any(keyword in content_lower for keyword in today_keywords)
-            tomorrow_only = any(keyword in content_lower for keyword in tomorrow_keywords)
+            today_only = bool(TODAY_RE.search(content_lower))
+            tomorrow_only = bool(TOMORROW_RE.search(content_lower))
             
             # Prepare query for GetTasksTool
             query = {}
@@ -185,13 +233,9 @@ class GeminiAgent(BaseGeminiStreaming):
             content_lower = content.lower()
             
             # Determine time period
-            today_keywords = ["today", "today's", "for today"]
-            tomorrow_keywords = ["tomorrow", "tomorrow's", "for tomorrow"]
-            upcoming_keywords = ["upcoming", "next", "coming", "future"]
-            
-            today_only = any(keyword in content_lower for keyword in today_keywords)
-            tomorrow_only = any(keyword in content_lower for keyword in tomorrow_keywords)
-            upcoming_only = any(keyword in content_lower for keyword in upcoming_keywords)
+            today_only = bool(TODAY_RE.search(content_lower))
+            tomorrow_only = bool(TOMORROW_RE.search(content_lower))
+            upcoming_only = bool(UPCOMING_RE.search(content_lower))
             
             # Prepare query for GetEventsTool
             query = {}
@@ -223,9 +267,11 @@ class GeminiAgent(BaseGeminiStreaming):
     async def _get_tasks_and_events(self, content: str) -> Dict[str, Any]:
         """Get both tasks and events based on user request."""
         try:
-            # Get tasks and events separately
-            tasks_result = await self._get_tasks(content)
-            events_result = await self._get_events(content)
+            # Fetch tasks and events concurrently
+            tasks_result, events_result = await asyncio.gather(
+                self._get_tasks(content),
+                self._get_events(content),
+            )
             
             # Combine results
             combined_result = {
@@ -246,10 +292,52 @@ class GeminiAgent(BaseGeminiStreaming):
             logger.error(f"Error getting tasks and events: {str(e)}")
             return {"success": False, "error": str(e)}
 
+    async def _generate_direct_response(self, content: str) -> AsyncIterable[str]:
+        """Answer the request with the LLM alone, without any tool routing."""
+        history = chat_history.get(self.session_id) if self.session_id else []
+        answer_parts = []
+        
+        if self.reasoning:
+            # Reasoning and final answer come from one streamed call, split on the sentinel
+            reasoning_prompt, _, _ = initialize_prompts()
+            messages = reasoning_prompt.format_messages(question=content, history=history)
+            
+            yield REASONING_START
+            reasoning_parts = []
+            in_answer = False
+            async with aclosing(split_reasoning_stream(self.stream_tokens(messages))) as stream:
+                async for token in stream:
+                    if in_answer:
+                        answer_parts.append(token)
+                    elif token == FINAL_ANSWER_START:
+                        in_answer = True
+                    else:
+                        reasoning_parts.append(token)
+                    yield token
+            
+            # Without a final-answer section, the reasoning text is all the user got
+            if not answer_parts:
+                answer_parts = reasoning_parts
+        else:
+            messages = [*history, HumanMessage(content=content)]
+            async with aclosing(self.stream_tokens(messages)) as stream:
+                async for token in stream:
+                    answer_parts.append(token)
+                    yield token
+        
+        if self.session_id:
+            chat_history.record(self.session_id, content, "".join(answer_parts))
+
     async def generate_response(self, content: str) -> AsyncIterable[str]:
         """Generate a response using the agent."""
         try:
-            await self.reset_callback()
+            # Without Google tools none of the task/event handlers can act, so skip
+            # intent detection and the LLM analysis calls it would trigger
+            if not self.tools:
+                logger.info("No Google tools available, answering directly")
+                async for chunk in self._generate_direct_response(content):
+                    yield chunk
+                return
             
             # Determine request type based on user intent
             content_lower = content.lower()
@@ -264,69 +352,39 @@ class GeminiAgent(BaseGeminiStreaming):
             is_task = False
             is_event = False
             
+            # Scan for the entity words once and reuse the results below
+            # ("meeting"/"event"/"task" also cover their plurals)
+            mentions_events = "meeting" in content_lower or "event" in content_lower
+            mentions_task_word = "task" in content_lower
+            mentions_tasks = mentions_task_word or "todo" in content_lower or "to-do" in content_lower or "to do" in content_lower
+            
             # Direct pattern matching for common retrieval phrases
-            if any(pattern in content_lower for pattern in [
-                "show my", "show all", "list my", "show me", "get my", "what are my", 
-                "all my", "my all", "all the", "see my", "view my", "check my"
-            ]):
+            if RETRIEVAL_PHRASE_RE.search(content_lower):
                 logger.info("Detected direct retrieval phrase")
-                if "meeting" in content_lower or "meetings" in content_lower or "event" in content_lower or "events" in content_lower:
+                if mentions_events:
                     logger.info("Direct retrieval phrase for events/meetings")
                     is_get_events = True
-                if "task" in content_lower or "tasks" in content_lower or "todo" in content_lower or "to-do" in content_lower or "to do" in content_lower:
+                if mentions_tasks:
                     logger.info("Direct retrieval phrase for tasks")
                     is_get_tasks = True
                 # If both are mentioned, prioritize the combined view
-                if ("meeting" in content_lower or "meetings" in content_lower or "event" in content_lower or "events" in content_lower) and \
-                   ("task" in content_lower or "tasks" in content_lower or "todo" in content_lower or "to-do" in content_lower or "to do" in content_lower):
+                if mentions_events and mentions_tasks:
                     logger.info("Direct retrieval phrase for both tasks and events")
                     is_get_both = True
                     # Make sure we don't trigger the individual retrievals
                     is_get_events = False
                     is_get_tasks = False
             
-            # Check for task retrieval request
-            get_task_keywords = ["show tasks", "list out my tasks", "get tasks", "list tasks", "view tasks", "what are my tasks", 
-                               "show my tasks", "display tasks", "check tasks", "list my tasks", "show my tasks", "check my tasks"]
-            
-            # Add keywords for specific time periods for tasks
-            time_specific_task_keywords = [
-                "tomorrow's tasks", "tomorrow tasks", "tasks for tomorrow", 
-                "today's tasks", "today tasks", "tasks for today",
-                "upcoming tasks", "next tasks", "show me my"
-            ]
-
-            # Check for event retrieval request
-            get_event_keywords = ["show events", "list events", "get events", "view events", "what are my events",
-                                "show my events", "display events", "check events", "list my events", "show meetings",
-                                "list meetings", "show my meetings", "check my calendar", "view calendar", "calendar events",
-                                "show all meetings", "show my all meetings", "show all my meetings", "show my all the meetings",
-                                "all meetings", "all events", "all my meetings", "all my events", "all of my meetings", 
-                                "all of my events", "meetings", "my meetings"]
-            
-            # Add keywords for specific time periods for events
-            time_specific_event_keywords = [
-                "tomorrow's events", "tomorrow events", "events for tomorrow",
-                "today's events", "today events", "events for today",
-                "upcoming events", "next events", "show me my events",
-                "tomorrow's meetings", "today's meetings", "upcoming meetings"
-            ]
-            
-            # Check for combined task and event requests
-            get_both_keywords = ["show my schedule", "show my today schedule", "show my tomorrow schedule", "what's on my schedule", "check my schedule",
-                               "what do i have", "view my schedule", "list everything", "show everything",
-                               "all tasks and events", "all events and tasks", "my agenda", "what's on my agenda"]
-            
             # Check if the request is about viewing tasks
-            is_get_tasks = any(keyword in content_lower for keyword in get_task_keywords)
-            is_time_specific_tasks = any(keyword in content_lower for keyword in time_specific_task_keywords)
+            is_get_tasks = bool(GET_TASK_RE.search(content_lower))
+            is_time_specific_tasks = bool(TIME_SPECIFIC_TASK_RE.search(content_lower))
             
             # Check if the request is about viewing events
-            is_get_events = any(keyword in content_lower for keyword in get_event_keywords)
-            is_time_specific_events = any(keyword in content_lower for keyword in time_specific_event_keywords)
+            is_get_events = bool(GET_EVENT_RE.search(content_lower))
+            is_time_specific_events = bool(TIME_SPECIFIC_EVENT_RE.search(content_lower))
             
             # Check if the request is about viewing both tasks and events
-            is_get_both = any(keyword in content_lower for keyword in get_both_keywords)
+            is_get_both = bool(GET_BOTH_RE.search(content_lower))
             
             # Log detection results for debugging
             logger.info(f"Intent detection: get_tasks={is_get_tasks}, time_specific_tasks={is_time_specific_tasks}")
@@ -334,20 +392,20 @@ class GeminiAgent(BaseGeminiStreaming):
             logger.info(f"Intent detection: get_both={is_get_both}")
             
             # Special handling for ambiguous request like "meetings" without clear context
-            if content_lower in ["meetings", "events", "tasks"]:
+            if content_lower in AMBIGUOUS_QUERIES:
                 logger.info("Processing ambiguous retrieval request as view request")
-                is_get_events = True if content_lower in ["meetings", "events"] else is_get_events
+                is_get_events = True if content_lower in AMBIGUOUS_EVENT_QUERIES else is_get_events
                 is_get_tasks = True if content_lower == "tasks" else is_get_tasks
             
             # Special handling for "all" phrases
             if "all" in content_lower:
-                if "meeting" in content_lower or "meetings" in content_lower or "event" in content_lower or "events" in content_lower:
+                if mentions_events:
                     logger.info("Processing 'all meetings/events' as a retrieval request")
                     is_get_events = True
-                if "task" in content_lower or "tasks" in content_lower:
+                if mentions_task_word:
                     logger.info("Processing 'all tasks' as a retrieval request")
                     is_get_tasks = True
-                if ("meetings" in content_lower or "events" in content_lower) and ("task" in content_lower or "tasks" in content_lower):
+                if ("meetings" in content_lower or "events" in content_lower) and mentions_task_word:
                     logger.info("Processing 'all tasks and events' as a combined retrieval request")
                     is_get_both = True
             
@@ -373,17 +431,7 @@ class GeminiAgent(BaseGeminiStreaming):
                         yield f"Task List: {combined_result.get('task_list', 'Default')}\n\n"
                         
                         for task in combined_result.get("tasks", []):
-                            status_emoji = "✅" if task["status"] == "completed" else "⏳"
-                            task_line = f"{status_emoji} {task['title']}"
-                            
-                            if task.get("due"):
-                                formatted_date = format_task_date(task["due"])
-                                task_line += f"\n   📅 Due: {formatted_date}"
-                            
-                            if task.get("notes"):
-                                task_line += f"\n   📝 Notes: {task['notes']}"
-                            
-                            yield f"{task_line}\n\n"
+                            yield f"{format_task_line(task)}\n\n"
                         
                         # Add separator if we also have events
                         if has_events:
@@ -394,31 +442,7 @@ class GeminiAgent(BaseGeminiStreaming):
                         yield "📅 **EVENTS/MEETINGS**\n\n"
                         
                         for event in combined_result.get("events", []):
-                            event_title = event.get("title", "Untitled Event")
-                            event_line = f"🗓️ {event_title}"
-                            
-                            # Format start and end times
-                            start_time = event.get("start", "")
-                            end_time = event.get("end", "")
-                            
-                            if start_time:
-                                formatted_start = format_task_date(start_time)
-                                if event.get("is_all_day"):
-                                    event_line += f"\n   ⏰ When: {formatted_start} (All day)"
-                                else:
-                                    formatted_end = format_task_date(end_time)
-                                    event_line += f"\n   ⏰ When: {formatted_start} to {formatted_end}"
-                            
-                            if event.get("location"):
-                                event_line += f"\n   📍 Location: {event['location']}"
-                            
-                            if event.get("meet_link"):
-                                event_line += f"\n   🔗 Meet: {event['meet_link']}"
-                            
-                            if event.get("link"):
-                                event_line += f"\n   🌐 Calendar: {event['link']}"
-                            
-                            yield f"{event_line}\n\n"
+                            yield f"{format_event_line(event, include_details=False)}\n\n"
                 else:
                     # Handle errors
                     if combined_result.get("tasks_error") and combined_result.get("events_error"):
@@ -454,17 +478,7 @@ class GeminiAgent(BaseGeminiStreaming):
                     yield f"Task List: {tasks_result.get('task_list', 'Default')}\n\n"
                     
                     for task in tasks_result.get("tasks", []):
-                        status_emoji = "✅" if task["status"] == "completed" else "⏳"
-                        task_line = f"{status_emoji} {task['title']}"
-                        
-                        if task.get("due"):
-                            formatted_date = format_task_date(task["due"])
-                            task_line += f"\n   📅 Due: {formatted_date}"
-                        
-                        if task.get("notes"):
-                            task_line += f"\n   📝 Notes: {task['notes']}"
-                        
-                        yield f"{task_line}\n\n"
+                        yield f"{format_task_line(task)}\n\n"
                 else:
                     yield f"❌ Failed to retrieve tasks: {tasks_result.get('error', 'Unknown error')}"
                 return
@@ -482,61 +496,21 @@ class GeminiAgent(BaseGeminiStreaming):
                         return
                     
                     for event in events_result.get("events", []):
-                        event_title = event.get("title", "Untitled Event")
-                        event_line = f"🗓️ {event_title}"
-                        
-                        # Format start and end times
-                        start_time = event.get("start", "")
-                        end_time = event.get("end", "")
-                        
-                        if start_time:
-                            formatted_start = format_task_date(start_time)
-                            if event.get("is_all_day"):
-                                event_line += f"\n   ⏰ When: {formatted_start} (All day)"
-                            else:
-                                formatted_end = format_task_date(end_time)
-                                event_line += f"\n   ⏰ When: {formatted_start} to {formatted_end}"
-                        
-                        if event.get("location"):
-                            event_line += f"\n   📍 Location: {event['location']}"
-                        
-                        if event.get("description"):
-                            event_line += f"\n   📝 Description: {event['description']}"
-                        
-                        if event.get("meet_link"):
-                            event_line += f"\n   🔗 Meet: {event['meet_link']}"
-                        
-                        if event.get("link"):
-                            event_line += f"\n   🌐 Calendar: {event['link']}"
-                        
-                        # Show attendees if present
-                        if event.get("attendees"):
-                            attendees_count = len(event["attendees"])
-                            if attendees_count > 0:
-                                event_line += f"\n   👥 Attendees: {attendees_count} people"
-                        
-                        yield f"{event_line}\n\n"
+                        yield f"{format_event_line(event)}\n\n"
                 else:
                     yield f"❌ Failed to retrieve events: {events_result.get('error', 'Unknown error')}"
                 return
 
-            # Check for event keywords (only for creation, retrieval is handled above)
-            event_keywords = ["meeting", "schedule meeting", "create meeting", "set meeting", 
-                            "event", "create event", "set event", "calendar event",
-                            "appointment", "schedule", "interview", "call", "conference",
-                            "webinar", "session", "catch up", "sync", "discussion"]
-            is_event = any(keyword in content_lower for keyword in event_keywords) and not (is_get_events or is_time_specific_events)
-            
-            # Check for task/reminder keywords first (after checking for retrievals)
-            task_keywords = ["reminder", "remind me", "create task", "set task", "set reminder", 
-                           "create reminder", "todo", "task"]
-            is_task = any(keyword in content_lower for keyword in task_keywords) and not (is_get_tasks or is_time_specific_tasks)
+            # Check for event and task/reminder creation (retrieval is handled above)
+            is_event = bool(EVENT_RE.search(content_lower)) and not (is_get_events or is_time_specific_events)
+            is_task = bool(TASK_RE.search(content_lower)) and not (is_get_tasks or is_time_specific_tasks)
             
             # If it's a task request, handle it directly without checking for events
             if is_task:
                 logger.info("Processing task/reminder request")
                 task_data = await self._prepare_task_data(content)
-                logger.info(f"Prepared task data: {json.dumps(task_data, indent=2)}")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(f"Prepared task data: {json.dumps(task_data)}")
                 
                 if task_data:
                     for tool in self.tools:
@@ -562,7 +536,8 @@ class GeminiAgent(BaseGeminiStreaming):
             if is_event:
                 logger.info("Processing event/meeting request")
                 event_data = await prepare_event_data(content, self.llm)
-                logger.info(f"Prepared event data: {json.dumps(event_data, indent=2)}")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(f"Prepared event data: {json.dumps(event_data)}")
                 
                 if event_data:
                     for tool in self.tools:
@@ -595,40 +570,31 @@ class GeminiAgent(BaseGeminiStreaming):
                 return
             
             # Handle other queries
-            if self.reasoning:
-                yield "reasoning start\n\n"
-                response = await self.llm.agenerate([[HumanMessage(content=f"Think step by step to answer this question: {content}")]])
-                reasoning_text = response.generations[0][0].text
-                yield reasoning_text
-                
-                yield "\n\nFinal Answer start\n\n"
-                summary_prompt = f"Based on the above reasoning, provide a concise final answer to the original question: {content}"
-                response = await self.llm.agenerate([[HumanMessage(content=summary_prompt)]])
-                yield response.generations[0][0].text
-            else:
-                response = await self.llm.agenerate([[HumanMessage(content=content)]])
-                yield response.generations[0][0].text
+            async for chunk in self._generate_direct_response(content):
+                yield chunk
         
         except Exception as e:
             logger.error(f"Error generating response: {str(e)}")
             raise HTTPException(status_code=500, detail=str(e))
-        finally:
-            if hasattr(self.callback, "done") and not self.callback.done.is_set():
-                self.callback.done.set()
 
-    async def process_chat_request(self, content: str, websearch: bool = False, reasoning: bool = False) -> StreamingResponse:
+    async def process_chat_request(
+        self,
+        content: str,
+        websearch: bool = False,
+        reasoning: bool = False,
+        session_id: Optional[str] = None
+    ) -> StreamingResponse:
         """Process a chat request and return a streaming response."""
         try:
             self.websearch = websearch
             self.reasoning = reasoning
-            return StreamingResponse(
-                self.generate_response(content),
-                media_type="text/event-stream",
-                headers={
-                    "Cache-Control": "no-cache",
-                    "Connection": "keep-alive",
-                }
-            )
+            self.session_id = session_id
+            stream = self.generate_response(content)
+            if not self.tools and not session_id and StreamCache.is_cacheable(content):
+                # Plain chat without Google tools is safe to replay across users
+                cache_key = StreamCache.make_key("gemini", content, websearch, reasoning)
+                stream = _stream_cache.replay_or_record(cache_key, stream)
+            return streaming_response(stream)
         except Exception as e:
             logger.error(f"Request processing error: {str(e)}")
             raise HTTPException(status_code=500, detail=str(e))
@@ -1,161 +1,187 @@
 from fastapi import HTTPException
 from fastapi.responses import StreamingResponse
-from typing import AsyncIterable
+from typing import AsyncIterable, List, Optional
 from langchain.schema import HumanMessage, SystemMessage
-from langchain.agents import initialize_agent, AgentType
 from langchain_core.runnables import RunnablePassthrough
 import asyncio
+import json
+import logging
+import os
 from src.utils.gpt4o_streaming import BaseStreamingLLM
 from src.tools.datetime.time_tool import CurrentTimeTool
 from src.tools.websearch.websearch_tool import WebSearchTool
-from src.utils.prompts import initialize_prompts
-from functools import lru_cache
-from langchain.callbacks import AsyncIteratorCallbackHandler
+from src.utils.prompts import initialize_prompts, get_batch_prompt
+from src.utils.stream_cache import StreamCache
+from src.utils.chat_history import chat_history
+from src.utils.streaming import aclosing, REASONING_START, FINAL_ANSWER_START, split_reasoning_stream, streaming_response
+
+logger = logging.getLogger(__name__)
+
+# Finished responses shared across requests, replayed without calling the model
+_stream_cache = StreamCache(maxsize=2048, ttl=300.0)
+
+# Per-phase output budgets; the reasoning budget covers the chain of thought plus the final answer
+DIRECT_MAX_TOKENS = int(os.getenv("DIRECT_MAX_TOKENS", "1024"))
+REASONING_MAX_TOKENS = int(os.getenv("REASONING_MAX_TOKENS", "2048"))
+
+# Stateless tools, built once instead of on every request
+current_time_tool = CurrentTimeTool()
+web_search_tool = WebSearchTool()
 
 class GPT4OAgent(BaseStreamingLLM):
     """GPT-4 Optimized Agent with streaming capabilities"""
 
-    def __init__(self, websearch: bool = False, reasoning: bool = False):
+    def __init__(self):
         super().__init__()
-        self.websearch = websearch
-        self.reasoning = reasoning
         
-        # Fix the unpacking issue by capturing all returns and only using the first three
-        prompts = initialize_prompts()
-        self.cot_prompt = prompts[0]
-        self.direct_prompt = prompts[1]
-        self.final_prompt = prompts[2]
+        reasoning_prompt, direct_prompt, _ = initialize_prompts()
+        self.reasoning_prompt = reasoning_prompt
+        self.direct_prompt = direct_prompt
         # Ignore the task_management_prompt as it's not needed for GPT4O
+        self.batch_prompt = get_batch_prompt()
         
         self._initialize_chains()
-        if websearch:
-            self.tools = [CurrentTimeTool(), WebSearchTool()]
-            self.agent = initialize_agent(
-                tools=self.tools,
-                llm=self.llm,
-                agent=AgentType.OPENAI_FUNCTIONS,
-                verbose=True
-            )
 
-    @lru_cache(maxsize=2)
     def _initialize_chains(self):
         """Initialize runnable sequences"""
         # Create runnable sequences using the pipe operator
-        self.cot_chain = (
+        self.reasoning_chain = (
             RunnablePassthrough() | 
-            self.cot_prompt | 
-            self.llm | 
+            self.reasoning_prompt | 
+            self.llm.bind(max_tokens=REASONING_MAX_TOKENS) | 
             (lambda x: {"text": x.content})
         )
 
         self.direct_chain = (
             RunnablePassthrough() | 
             self.direct_prompt | 
-            self.llm | 
+            self.llm.bind(max_tokens=DIRECT_MAX_TOKENS) | 
             (lambda x: {"text": x.content})
         )
 
-        self.final_chain = (
-            RunnablePassthrough() | 
-            self.final_prompt | 
-            self.llm | 
-            (lambda x: {"text": x.content})
+        self.batch_chain = (
+            self.batch_prompt | 
+            self.llm.bind(response_format={"type": "json_object"}) | 
+            (lambda x: x.content)
         )
 
-    async def _reset_callback(self):
-        """Reset callback handler"""
-        self.callback.done.set()
-        await asyncio.sleep(0.1)
-        self.callback.done.clear()
-        self.callback = AsyncIteratorCallbackHandler()
-        self.llm.callbacks = [self.callback]
+    async def _answer_one(self, query: str, semaphore: asyncio.Semaphore) -> str:
+        """Answer a single query, holding a concurrency slot for the model call."""
+        async with semaphore:
+            result = await self.direct_chain.ainvoke({"question": query})
+        return result["text"]
 
-    async def generate_response(self, content: str) -> AsyncIterable[str]:
-        """Generate streaming response from the model"""
+    async def _answer_batch(self, queries: List[str], semaphore: asyncio.Semaphore) -> List[str]:
+        """Answer one batch of queries with a single model call."""
+        questions = "\n".join(f"[{index}]: {query}" for index, query in enumerate(queries))
         try:
-            if self.websearch:
-                # First get current time
-                time_tool = CurrentTimeTool()
-                current_time = await time_tool._arun()
+            async with semaphore:
+                output = await self.batch_chain.ainvoke({"questions": questions})
+            answers = json.loads(output).get("answers")
+            if isinstance(answers, list) and len(answers) == len(queries):
+                return [str(answer) for answer in answers]
+            logger.warning(f"Batch answer count mismatch: expected {len(queries)}, falling back to single queries")
+        except Exception as e:
+            logger.warning(f"Batch answer failed, falling back to single queries: {str(e)}")
+        
+        # Malformed batch output: fall back to answering each query on its own
+        return list(await asyncio.gather(*(self._answer_one(query, semaphore) for query in queries)))
 
-                # Then perform web search
+    async def run_batch(self, queries: List[str], semaphore: asyncio.Semaphore, batch_size: int = 8) -> List[str]:
+        """
+        Answer many independent queries, packing up to batch_size of them into each
+        model call to cut the request count. Answers are returned in query order.
+        Every model call, including per-query fallbacks, holds a slot of the semaphore.
+        """
+        batches = [queries[i:i + batch_size] for i in range(0, len(queries), batch_size)]
+        results = await asyncio.gather(*(self._answer_batch(batch, semaphore) for batch in batches))
+        return [answer for batch in results for answer in batch]
+
+    async def generate_response(
+        self,
+        content: str,
+        websearch: bool = False,
+        reasoning: bool = False,
+        session_id: Optional[str] = None
+    ) -> AsyncIterable[str]:
+        """Generate streaming response from the model"""
+        try:
+            question = content
+            history = chat_history.get(session_id) if session_id else []
+            answer_parts = []
+            
+            if websearch:
+                # Fetch the current time and web results concurrently
                 yield "Searching the web\n\n"
-                web_tool = WebSearchTool()
-                web_results = await web_tool._arun(content)
+                current_time, web_results = await asyncio.gather(
+                    current_time_tool._arun(),
+                    web_search_tool._arun(content)
+                )
                 
-                # Combine context
+                # Combine context, keeping the time last since it changes on every call
                 content = f"""
-Current Time: {current_time}
 User Question: {content}
 Web Search Results: {web_results}
+Current Time: {current_time}
 """
 
-            if self.reasoning:
-                yield "reasoning start\n\n"
-                
-                # Get reasoning with enhanced context
-                self.callback = AsyncIteratorCallbackHandler()
-                self.llm.callbacks = [self.callback]
-                reasoning_task = asyncio.create_task(
-                    self.cot_chain.ainvoke({"question": content})
-                )
-                
-                async for token in self.stream_tokens():
-                    yield token
-                
-                reasoning_result = await reasoning_task
-                reasoning_text = reasoning_result['text']
-                await self._reset_callback()
-                
-                # Final answer incorporating all context
-                yield "\n\nFinal Answer start\n\n"
-                
-                final_task = asyncio.create_task(
-                    self.final_chain.ainvoke({
-                        "chain_of_thought": reasoning_text,
-                        "web_context": web_results if self.websearch else ""
-                    })
-                )
+            inputs = {"question": content, "history": history}
+            if reasoning:
+                yield REASONING_START
                 
-                async for token in self.stream_tokens():
-                    yield token
+                # Reasoning and final answer arrive in one stream, split on the sentinel
+                tokens = self.stream_tokens(self.reasoning_chain, inputs)
+                reasoning_parts = []
+                in_answer = False
+                async with aclosing(split_reasoning_stream(tokens)) as stream:
+                    async for token in stream:
+                        if in_answer:
+                            answer_parts.append(token)
+                        elif token == FINAL_ANSWER_START:
+                            in_answer = True
+                        else:
+                            reasoning_parts.append(token)
+                        yield token
                 
-                await final_task
+                # Without a final-answer section, the reasoning text is all the user got
+                if not answer_parts:
+                    answer_parts = reasoning_parts
                 
             else:
                 # Direct response
-                direct_task = asyncio.create_task(
-                    self.direct_chain.ainvoke({"question": content})
-                )
-                
-                async for token in self.stream_tokens():
-                    yield token
-                
-                await direct_task
+                async with aclosing(self.stream_tokens(self.direct_chain, inputs)) as stream:
+                    async for token in stream:
+                        answer_parts.append(token)
+                        yield token
+
+            # Only completed turns are remembered, with the user's own wording
+            if session_id:
+                chat_history.record(session_id, question, "".join(answer_parts))
 
         except Exception as e:
             raise HTTPException(
                 status_code=500,
                 detail=f"Generation error: {str(e)}"
             )
-        finally:
-            self.callback.done.set()
 
-    async def process_chat_request(self, content: str, websearch: bool = False, reasoning: bool = False) -> StreamingResponse:
+    async def process_chat_request(
+        self,
+        content: str,
+        websearch: bool = False,
+        reasoning: bool = False,
+        session_id: Optional[str] = None
+    ) -> StreamingResponse:
         """Process chat request and return streaming response"""
         try:
-            self.websearch = websearch
-            self.reasoning = reasoning
-            return StreamingResponse(
-                self.generate_response(content),
-                media_type="text/event-stream",
-                headers={
-                    "Cache-Control": "no-cache",
-                    "Connection": "keep-alive",
-                }
-            )
+            stream = self.generate_response(content, websearch, reasoning, session_id)
+            if not (session_id or websearch) and StreamCache.is_cacheable(content):
+                # Identical questions within the TTL are replayed without calling the model;
+                # answers that depend on session history or live search results are never shared
+                cache_key = StreamCache.make_key("gpt4o", content, websearch, reasoning)
+                stream = _stream_cache.replay_or_record(cache_key, stream)
+            return streaming_response(stream)
         except Exception as e:
             raise HTTPException(
                 status_code=500,
                 detail=f"Request processing error: {str(e)}"
-            )
\ No newline at end of file
+            )
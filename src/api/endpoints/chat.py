@@ -1,46 +1,182 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, Field
 from src.agents.gpt4o import GPT4OAgent
 from src.agents.gemini import GeminiAgent
-from typing import Optional, Literal
+from src.utils.chat_jobs import ChatJob, chat_jobs
+from src.utils.streaming import first_responding_stream, streaming_response
+from typing import Callable, Dict, List, Optional, Literal, Union
+from functools import lru_cache
+import asyncio
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Hedged requests double model spend, so the server has to opt in as well
+HEDGING_ENABLED = os.getenv("HEDGING_ENABLED", "0") == "1"
+
+# Upper bound on concurrent model calls made by one /chat/batch request
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "8"))
+# Upper bound on the number of items accepted by one /chat/batch request
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "64"))
+
+@lru_cache(maxsize=1)
+def get_gpt4o_agent() -> GPT4OAgent:
+    """Return the shared GPT4O agent; mode flags are passed per request."""
+    return GPT4OAgent()
+
 class ChatRequest(BaseModel):
     content: str
-    model: Literal["gpt4o", "gemini"] = "gpt4"
+    model: Literal["gpt4o", "gemini"] = "gpt4o"
     websearch: Optional[bool] = False
     reasoning: Optional[bool] = False
     google_access_token: Optional[str] = None
+    # Optional conversation id; turns sharing it see the previous messages
+    session_id: Optional[str] = None
+    # Race both models and stream whichever answers first (plain chat only)
+    hedge: Optional[bool] = False
+
+class BatchChatRequest(BaseModel):
+    items: List[ChatRequest] = Field(..., max_length=BATCH_MAX_ITEMS)
+
+def _gpt4o_agent(request: ChatRequest, gpt4o_agent: GPT4OAgent) -> GPT4OAgent:
+    # For GPT4O, don't pass the Google access token as it's not currently supported
+    logger.info(f"Using GPT4O agent. Note: Google Tasks integration not available for this model.")
+    return gpt4o_agent
+
+def _gemini_agent(request: ChatRequest, gpt4o_agent: GPT4OAgent) -> GeminiAgent:
+    # For Gemini, pass the Google access token as it's supported
+    logger.info(f"Initializing Gemini agent with Google Tasks access: {bool(request.google_access_token)}")
+    return GeminiAgent(websearch=request.websearch, reasoning=request.reasoning, google_access_token=request.google_access_token)
+
+# Agent factory per model name; each gets the request and the injected shared GPT4O agent
+AGENTS: Dict[str, Callable[[ChatRequest, GPT4OAgent], Union[GPT4OAgent, GeminiAgent]]] = {
+    "gpt4o": _gpt4o_agent,
+    "gemini": _gemini_agent,
+}
+
+def _can_hedge(request: ChatRequest) -> bool:
+    """Hedge only plain chat, where both models give interchangeable answers."""
+    return bool(
+        HEDGING_ENABLED and request.hedge
+        and not (request.websearch or request.reasoning or request.google_access_token or request.session_id)
+    )
+
+async def _start_chat(request: ChatRequest, gpt4o_agent: GPT4OAgent):
+    """Dispatch a chat request to its model's agent and return the streaming response."""
+    agent = AGENTS[request.model](request, gpt4o_agent)
+    return await agent.process_chat_request(
+        content=request.content,
+        websearch=request.websearch,
+        reasoning=request.reasoning,
+        session_id=request.session_id
+    )
 
 @router.post("/chat")
-async def stream_chat(request: ChatRequest):
+async def stream_chat(request: ChatRequest, gpt4o_agent: GPT4OAgent = Depends(get_gpt4o_agent)):
     # Log if Google access token is provided (without revealing the token itself)
-    if request.google_access_token:
-        token_preview = request.google_access_token[:10] + "..." if request.google_access_token else "None"
-        logger.info(f"Google access token provided: {token_preview}")
-        logger.info(f"Google access token length: {len(request.google_access_token) if request.google_access_token else 0}")
+    access_token = request.google_access_token
+    if access_token:
+        logger.info(f"Google access token provided: {access_token[:10]}...")
+        logger.info(f"Google access token length: {len(access_token)}")
     else:
         logger.warning("No Google access token provided in request")
     
     try:
-        if request.model == "gpt4o":
-            # For GPT4O, don't pass the Google access token as it's not currently supported
-            logger.info(f"Initializing GPT4O agent. Note: Google Tasks integration not available for this model.")
-            agent = GPT4OAgent(websearch=request.websearch, reasoning=request.reasoning)
+        if _can_hedge(request):
+            logger.info("Hedging chat request across GPT4O and Gemini")
+            return streaming_response(first_responding_stream(
+                gpt4o_agent.generate_response(request.content),
+                GeminiAgent().generate_response(request.content)
+            ))
+        
+        return await _start_chat(request, gpt4o_agent)
+    except Exception as e:
+        logger.error(f"Error initializing agent: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error initializing agent: {str(e)}")
+
+def _can_pack(request: ChatRequest) -> bool:
+    """Plain GPT4O questions share no state, so several can be answered in one model call."""
+    return request.model == "gpt4o" and not (request.websearch or request.reasoning or request.session_id)
+
+async def _collect_chat(request: ChatRequest, gpt4o_agent: GPT4OAgent, semaphore: asyncio.Semaphore) -> str:
+    """Run one chat request to completion and return the full response text."""
+    async with semaphore:
+        response = await _start_chat(request, gpt4o_agent)
+        parts = []
+        async for chunk in response.body_iterator:
+            parts.append(chunk.decode("utf-8") if isinstance(chunk, bytes) else chunk)
+        return "".join(parts)
+
+@router.post("/chat/batch")
+async def batch_chat(request: BatchChatRequest, gpt4o_agent: GPT4OAgent = Depends(get_gpt4o_agent)):
+    """
+    Answer several chat requests concurrently and return the complete responses in order.
+    Plain GPT4O questions are packed into shared model calls; everything else runs on its own.
+    """
+    semaphore = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+    packed = [index for index, item in enumerate(request.items) if _can_pack(item)]
+    packed_set = set(packed)
+    others = [index for index in range(len(request.items)) if index not in packed_set]
+    
+    packed_answers, *other_results = await asyncio.gather(
+        gpt4o_agent.run_batch([request.items[index].content for index in packed], semaphore),
+        *(_collect_chat(request.items[index], gpt4o_agent, semaphore) for index in others),
+        return_exceptions=True
+    )
+    if isinstance(packed_answers, Exception):
+        packed_answers = [packed_answers] * len(packed)
+    
+    results: List[Union[str, Exception]] = [None] * len(request.items)
+    for index, result in zip(packed, packed_answers):
+        results[index] = result
+    for index, result in zip(others, other_results):
+        results[index] = result
+    
+    responses = []
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error(f"Batch chat item failed: {str(result)}")
+            responses.append({"success": False, "error": str(result)})
         else:
-            # For Gemini, pass the Google access token as it's supported
-            logger.info(f"Initializing Gemini agent with Google Tasks access: {bool(request.google_access_token)}")
-            agent = GeminiAgent(websearch=request.websearch, reasoning=request.reasoning, google_access_token=request.google_access_token)
-            
-        return await agent.process_chat_request(
-            content=request.content,
-            websearch=request.websearch,
-            reasoning=request.reasoning
-        )
+            responses.append({"success": True, "content": result})
+    return {"results": responses}
+
+@router.post("/chat/jobs", status_code=202)
+async def submit_chat_job(request: ChatRequest, gpt4o_agent: GPT4OAgent = Depends(get_gpt4o_agent)):
+    """
+    Start a chat generation in the background and return its job id.
+    Long reasoning or web search answers keep running even if the client disconnects.
+    """
+    try:
+        response = await _start_chat(request, gpt4o_agent)
     except Exception as e:
         logger.error(f"Error initializing agent: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error initializing agent: {str(e)}")
+    
+    job = chat_jobs.submit(response.body_iterator)
+    return {"job_id": job.job_id, "status": job.status}
+
+def _get_job(job_id: str) -> ChatJob:
+    job = chat_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Chat job not found")
+    return job
+
+@router.get("/chat/jobs/{job_id}")
+async def get_chat_job(job_id: str):
+    """Return a chat job's status and the output produced so far."""
+    job = _get_job(job_id)
+    return {
+        "job_id": job.job_id,
+        "status": job.status,
+        "content": "".join(job.chunks),
+        "error": job.error
+    }
+
+@router.get("/chat/jobs/{job_id}/stream")
+async def stream_chat_job(job_id: str):
+    """Stream a chat job's output from the start, following it live until it finishes."""
+    return streaming_response(_get_job(job_id).follow())
@@ -37,7 +37,7 @@ async def exchange_token(request: TokenRequest):
     Exchange the authorization code for tokens
     """
     try:
-        tokens = oauth_handler.exchange_code_for_tokens(request.code)
+        tokens = await oauth_handler.exchange_code_for_tokens(request.code)
         return {
             "access_token": tokens.get("access_token"),
             "refresh_token": tokens.get("refresh_token"),
@@ -53,7 +53,7 @@ async def refresh_token(request: RefreshRequest):
     Refresh the access token using a refresh token
     """
     try:
-        tokens = oauth_handler.refresh_access_token(request.refresh_token)
+        tokens = await oauth_handler.refresh_access_token(request.refresh_token)
         return {
             "access_token": tokens.get("access_token"),
             "token_type": tokens.get("token_type"),
@@ -68,7 +68,7 @@ async def revoke_token(token: str):
     Revoke the specified token
     """
     try:
-        success = oauth_handler.revoke_token(token)
+        success = await oauth_handler.revoke_token(token)
         if success:
             return {"message": "Token revoked successfully"}
         else:
@@ -86,7 +86,7 @@ async def auth_callback(code: str = Query(...), state: Optional[str] = Query(Non
     try:
         # In a real-world scenario, you might want to store the tokens
         # or send them to the frontend via a secure method
-        tokens = oauth_handler.exchange_code_for_tokens(code)
+        tokens = await oauth_handler.exchange_code_for_tokens(code)
         return {"message": "Authentication successful", "access_token": tokens.get("access_token")}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Callback error: {str(e)}")
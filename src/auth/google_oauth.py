@@ -1,8 +1,10 @@
 import os
-import requests
+from urllib.parse import urlencode
 from typing import Dict, Any, Optional
 from fastapi import HTTPException
 
+from src.utils.http_client import get_async_client
+
 class GoogleOAuth:
     """
     Handles OAuth authentication with Google API
@@ -16,11 +18,8 @@ class GoogleOAuth:
         
         if not all([self.client_id, self.client_secret, self.redirect_uri, self.oauth_scopes]):
             raise ValueError("Google OAuth credentials not properly configured")
-    
-    def get_authorization_url(self) -> str:
-        """
-        Returns the URL for Google OAuth authorization
-        """
+        
+        # The authorization URL only depends on the settings above, so build it once
         auth_url = "https://accounts.google.com/o/oauth2/auth"
         params = {
             "client_id": self.client_id,
@@ -30,12 +29,15 @@ class GoogleOAuth:
             "access_type": "offline",
             "prompt": "consent"
         }
-        
-        # Build the URL
-        query_string = "&".join([f"{key}={value}" for key, value in params.items()])
-        return f"{auth_url}?{query_string}"
+        self._auth_url = f"{auth_url}?{urlencode(params)}"
+    
+    def get_authorization_url(self) -> str:
+        """
+        Returns the URL for Google OAuth authorization
+        """
+        return self._auth_url
     
-    def exchange_code_for_tokens(self, code: str) -> Dict[str, Any]:
+    async def exchange_code_for_tokens(self, code: str) -> Dict[str, Any]:
         """
         Exchange the authorization code for access and refresh tokens
         """
@@ -48,14 +50,14 @@ class GoogleOAuth:
             "grant_type": "authorization_code"
         }
         
-        response = requests.post(token_url, data=data)
+        response = await get_async_client().post(token_url, data=data)
         
         if response.status_code != 200:
             raise HTTPException(status_code=400, detail=f"Failed to exchange code for tokens: {response.text}")
         
         return response.json()
     
-    def refresh_access_token(self, refresh_token: str) -> Dict[str, Any]:
+    async def refresh_access_token(self, refresh_token: str) -> Dict[str, Any]:
         """
         Use the refresh token to get a new access token
         """
@@ -67,20 +69,20 @@ class GoogleOAuth:
             "grant_type": "refresh_token"
         }
         
-        response = requests.post(token_url, data=data)
+        response = await get_async_client().post(token_url, data=data)
         
         if response.status_code != 200:
             raise HTTPException(status_code=400, detail=f"Failed to refresh token: {response.text}")
         
         return response.json()
     
-    def revoke_token(self, token: str) -> bool:
+    async def revoke_token(self, token: str) -> bool:
         """
         Revoke the specified token
         """
         revoke_url = "https://oauth2.googleapis.com/revoke"
         params = {"token": token}
         
-        response = requests.post(revoke_url, params=params)
+        response = await get_async_client().post(revoke_url, params=params)
         
         return response.status_code == 200
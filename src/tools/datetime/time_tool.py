@@ -1,34 +1,43 @@
+import time
+import httpx
 import requests
 from langchain.tools import BaseTool
-from typing import ClassVar
+from typing import ClassVar, Dict, Tuple
+from src.utils.http_client import get_async_client
+
+TIME_API_URL = "https://timeapi.io/api/Time/current/zone"
+TIMEZONES = {
+    "delhi": "Asia/Kolkata",
+    "kolkata": "Asia/Kolkata",
+    "new york": "America/New_York",
+    "los angeles": "America/Los_Angeles",
+    "london": "Europe/London",
+    "paris": "Europe/Paris",
+    "tokyo": "Asia/Tokyo"
+}
+
+# Recent answers per city, so back-to-back chat requests skip the HTTP call
+_CACHE_TTL_SECONDS = 30.0
+_time_cache: Dict[str, Tuple[float, str]] = {}
 
 class CurrentTimeTool(BaseTool):
     name: ClassVar[str] = "current_time"
     description: ClassVar[str] = "Fetches the correct current time for a given city using TimeAPI.io."
 
+    @staticmethod
+    def _format_time(city: str, data: dict) -> str:
+        if "dateTime" in data:
+            # Minute precision keeps the prompt identical for requests within the same minute
+            return f"Current time in {city}: {data['dateTime'][:16]} (TimeZone: {data['timeZone']})"
+        return f"Error: {data.get('error', 'Unknown error')}"
+
     def _run(self, city: str = "Kolkata") -> str:
         """Fetch the current time using TimeAPI.io."""
         try:
-            timezones = {
-                "delhi": "Asia/Kolkata",
-                "kolkata": "Asia/Kolkata",
-                "new york": "America/New_York",
-                "los angeles": "America/Los_Angeles",
-                "london": "Europe/London",
-                "paris": "Europe/Paris",
-                "tokyo": "Asia/Tokyo"
-            }
-
-            timezone = timezones.get(city.lower(), "Asia/Kolkata")
-            url = f"https://timeapi.io/api/Time/current/zone?timeZone={timezone}"
-            response = requests.get(url)
+            timezone = TIMEZONES.get(city.lower(), "Asia/Kolkata")
+            response = requests.get(TIME_API_URL, params={"timeZone": timezone})
             response.raise_for_status()
-            data = response.json()
-
-            if "dateTime" in data:
-                return f"Current time in {city}: {data['dateTime']} (TimeZone: {data['timeZone']})"
-            else:
-                return f"Error: {data.get('error', 'Unknown error')}"
+            return self._format_time(city, response.json())
         except requests.exceptions.RequestException as e:
             return f"Error: {str(e)}. Please check your network connection or try again later."
         except Exception as e:
@@ -36,4 +45,22 @@ class CurrentTimeTool(BaseTool):
 
     async def _arun(self, city: str = "Kolkata") -> str:
         """Async version of fetching the current time."""
-        return self._run(city)
+        key = city.lower()
+        now = time.monotonic()
+        cached = _time_cache.get(key)
+        if cached and now - cached[0] < _CACHE_TTL_SECONDS:
+            return cached[1]
+
+        try:
+            timezone = TIMEZONES.get(key, "Asia/Kolkata")
+            response = await get_async_client().get(TIME_API_URL, params={"timeZone": timezone}, timeout=10.0)
+            response.raise_for_status()
+            data = response.json()
+            result = self._format_time(city, data)
+            if "dateTime" in data:
+                _time_cache[key] = (now, result)
+            return result
+        except httpx.HTTPError as e:
+            return f"Error: {str(e)}. Please check your network connection or try again later."
+        except Exception as e:
+            return f"Error: {str(e)}. If the issue persists, please provide your location or time zone."
@@ -1,14 +1,91 @@
-from typing import Optional, ClassVar, Dict
+from typing import Any, Optional, ClassVar, Dict, List, Tuple
 import logging
-import requests
-import json
+from requests.exceptions import RequestException
+import orjson
 import uuid
+import httpx
+from collections import OrderedDict
 from langchain.tools import BaseTool
 from datetime import datetime, timedelta
-from pydantic import Field
+from functools import lru_cache
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, ValidationError, field_validator
+from src.utils.http_client import get_session, send_with_retry
+from src.utils.time_utils import RELATIVE_DAYS
+from src.utils.token_utils import token_key
 
 logger = logging.getLogger(__name__)
 
+USERINFO_CACHE_SIZE = 1024
+TOOL_INSTANCE_CACHE_SIZE = 256
+USERINFO_URL = "https://www.googleapis.com/oauth2/v2/userinfo"
+CALENDAR_API_URL = "https://www.googleapis.com/calendar/v3"
+EVENTS_URL = CALENDAR_API_URL + "/calendars/primary/events"
+# Conference links need conferenceDataVersion=1; sendUpdates emails the attendees
+EVENT_INSERT_PARAMS = {"conferenceDataVersion": 1, "sendUpdates": "all"}
+
+# Events are scheduled in IST
+EVENT_TIMEZONE = "Asia/Kolkata"
+EVENT_UTC_OFFSET = "+05:30"
+
+# Locations that get a Google Meet link attached
+VIRTUAL_LOCATIONS = frozenset({"google meet", "virtual meeting", "online"})
+
+# Fixed error replies, serialized once
+MISSING_TITLE_RESPONSE = orjson.dumps({"success": False, "error": "Event title/summary is required"}).decode()
+INVALID_INPUT_RESPONSE = orjson.dumps({"success": False, "error": "Invalid event data format"}).decode()
+CREATE_FAILED_RESPONSE = orjson.dumps({"success": False, "error": "Failed to create calendar event"}).decode()
+
+# Reminders set on every event; shared by all request bodies, so never mutate it
+DEFAULT_REMINDERS = {
+    "useDefault": False,
+    "overrides": (
+        {"method": "email", "minutes": 1440},
+        {"method": "email", "minutes": 60},
+        {"method": "popup", "minutes": 10}
+    )
+}
+
+class EventInput(BaseModel):
+    """Tool input, parsed once; "title" and "notes" are accepted as aliases for "summary" and "description"."""
+    model_config = ConfigDict(frozen=True)
+    
+    summary: str = Field(default="", validation_alias=AliasChoices("summary", "title"))
+    description: str = Field(default="", validation_alias=AliasChoices("description", "notes"))
+    location: Optional[str] = None
+    start_time: Optional[str] = None
+    end_time: Optional[str] = None
+    due: Optional[str] = None
+    attendees: List[Any] = Field(default_factory=list)
+    create_conference: bool = True
+    repeat: Optional[Any] = None
+    recurrence: Optional[Any] = None
+    reminders: Optional[Any] = None
+    
+    @field_validator("summary", "description", mode="before")
+    @classmethod
+    def none_as_empty(cls, value: Any) -> Any:
+        return "" if value is None else value
+    
+    @field_validator("attendees", mode="before")
+    @classmethod
+    def attendees_as_list(cls, value: Any) -> Any:
+        # Anything but a list carries no usable attendees, so it is ignored
+        return value if isinstance(value, list) else []
+
+@lru_cache(maxsize=256)
+def _parse_clock(value: str) -> Optional[Tuple[int, int]]:
+    """Parse "HH:MM" into (hours, minutes), or None if it is not a valid time of day"""
+    # Slice around the colon instead of splitting, so no intermediate list is built
+    if len(value) < 4 or value[-3] != ":":
+        return None
+    try:
+        hours, minutes = int(value[:-3]), int(value[-2:])
+    except ValueError:
+        return None
+    if 0 <= hours < 24 and 0 <= minutes < 60:
+        return hours, minutes
+    return None
+
 class CreateEventTool(BaseTool):
     """Tool for creating events/meetings in Google Calendar"""
     name: ClassVar[str] = "create_event"
@@ -52,227 +129,309 @@ class CreateEventTool(BaseTool):
     }
     """
     access_token: str = Field(description="Google Calendar API access token")
-    calendar_api_url: str = Field(default="https://www.googleapis.com/calendar/v3", description="Google Calendar API URL")
+    calendar_api_url: ClassVar[str] = CALENDAR_API_URL
     headers: Dict[str, str] = Field(default_factory=dict, description="Request headers")
+    # Token hash -> userinfo, shared by all instances since a token's owner never changes
+    _userinfo_cache: ClassVar["OrderedDict[str, dict]"] = OrderedDict()
+    # Token hash -> tool, so repeat requests with the same token skip building and validating a new one
+    _instances: ClassVar["OrderedDict[str, CreateEventTool]"] = OrderedDict()
     
     def __init__(self, access_token: str):
         """Initialize the tool with access token"""
-        super().__init__(
-            access_token=access_token,
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "Content-Type": "application/json"
-            }
-        )
+        super().__init__(access_token=access_token)
+        # Assigned after validation; the headers are built here, not taken from user input
+        self.headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json"
+        }
 
-    def _create_calendar_event(self, event_data: dict) -> dict:
-        """Create a Calendar event"""
-        try:
-            # Format event data with clean summary
-            summary = event_data.get("summary", event_data.get("title", "New Event"))
-            
-            event_body = {
-                "summary": summary,
-                "description": event_data.get("description", event_data.get("notes", "")),
-                "location": event_data.get("location", "Google Meet")
-            }
-            
-            # Get user info to set as organizer
+    @classmethod
+    def get_instance(cls, access_token: str) -> "CreateEventTool":
+        """Return the cached tool for an access token, creating it on first use"""
+        key = token_key(access_token)
+        tool = cls._instances.get(key)
+        if tool is None:
+            tool = cls(access_token)
+            cls._instances[key] = tool
+            if len(cls._instances) > TOOL_INSTANCE_CACHE_SIZE:
+                cls._instances.popitem(last=False)
+        else:
+            cls._instances.move_to_end(key)
+        return tool
+
+    def _cached_userinfo(self, key: str) -> Optional[dict]:
+        """Return a cached profile and mark it as recently used"""
+        user_info = self._userinfo_cache.get(key)
+        if user_info is not None:
+            self._userinfo_cache.move_to_end(key)
+        return user_info
+
+    def _store_userinfo(self, key: str, user_info: dict) -> None:
+        """Cache a profile, evicting the least recently used one"""
+        self._userinfo_cache[key] = user_info
+        if len(self._userinfo_cache) > USERINFO_CACHE_SIZE:
+            self._userinfo_cache.popitem(last=False)
+
+    def _get_userinfo(self) -> dict:
+        """Return the token owner's profile, fetching it only once per access token"""
+        key = token_key(self.access_token)
+        user_info = self._cached_userinfo(key)
+        if user_info is not None:
+            return user_info
+        
+        response = get_session().get(USERINFO_URL, headers=self.headers)
+        response.raise_for_status()
+        user_info = orjson.loads(response.content)
+        self._store_userinfo(key, user_info)
+        return user_info
+
+    async def _aget_userinfo(self) -> dict:
+        """Async version of the userinfo lookup"""
+        key = token_key(self.access_token)
+        user_info = self._cached_userinfo(key)
+        if user_info is not None:
+            return user_info
+        
+        response = await send_with_retry("GET", USERINFO_URL, headers=self.headers, timeout=15.0)
+        response.raise_for_status()
+        user_info = orjson.loads(response.content)
+        self._store_userinfo(key, user_info)
+        return user_info
+
+    @staticmethod
+    def _set_organizer(event_body: dict, user_info: dict) -> None:
+        """Mark the token owner as creator and organizer of the event"""
+        event_body["creator"] = {
+            "email": user_info.get("email"),
+            "self": True
+        }
+        event_body["organizer"] = event_body["creator"]
+
+    def _build_event_body(self, event_data: EventInput, now: Optional[datetime] = None) -> dict:
+        """
+        Build the Calendar API request body from the tool input, without any I/O.
+        Callers building many bodies pass `now` so the clock is read once.
+        """
+        event_body = {
+            "summary": event_data.summary,
+            "description": event_data.description,
+            "location": event_data.location if event_data.location is not None else "Google Meet"
+        }
+        
+        # Add attendees if provided (plain email strings or {"email": ...} dicts)
+        attendees = event_data.attendees
+        if attendees:
+            event_body["attendees"] = [
+                {"email": attendee.strip() if isinstance(attendee, str) else attendee["email"], "responseStatus": "needsAction"}
+                for attendee in attendees
+                if isinstance(attendee, str) or (isinstance(attendee, dict) and "email" in attendee)
+            ]
+        
+        # Set start and end times
+        date_str = event_data.due or "today"
+        start_time = event_data.start_time
+        end_time = event_data.end_time
+        
+        # Parse date
+        now = now or datetime.now()
+        offset = RELATIVE_DAYS.get(date_str.lower())
+        if offset is not None:
+            start_date = now + timedelta(days=offset)
+        else:
             try:
-                user_info_response = requests.get(
-                    "https://www.googleapis.com/oauth2/v2/userinfo",
-                    headers=self.headers
-                )
-                user_info_response.raise_for_status()
-                user_info = user_info_response.json()
-                
-                # Set creator and organizer
-                event_body["creator"] = {
-                    "email": user_info.get("email"),
-                    "self": True
-                }
-                event_body["organizer"] = event_body["creator"]
-                
-            except Exception as e:
-                logger.error(f"Error getting user info: {str(e)}")
-            
-            # Add attendees if provided
-            if "attendees" in event_data and event_data["attendees"]:
-                if isinstance(event_data["attendees"], list):
-                    event_body["attendees"] = []
-                    for attendee in event_data["attendees"]:
-                        if isinstance(attendee, dict) and "email" in attendee:
-                            event_body["attendees"].append({
-                                "email": attendee["email"],
-                                "responseStatus": "needsAction"
-                            })
-                        elif isinstance(attendee, str):
-                            event_body["attendees"].append({
-                                "email": attendee.strip(),
-                                "responseStatus": "needsAction"
-                            })
-            
-            # Set start and end times
-            date_str = event_data.get("due", "today")
-            start_time = event_data.get("start_time", "09:00")
-            end_time = event_data.get("end_time")
-            
-            # Parse date
-            if date_str.lower() == "today":
-                start_date = datetime.now()
-            elif date_str.lower() == "tomorrow":
-                start_date = datetime.now() + timedelta(days=1)
-            else:
-                try:
-                    start_date = datetime.strptime(date_str, "%Y-%m-%d")
-                except ValueError:
-                    start_date = datetime.now()
-            
-            # Ensure start_date is not in the past
-            now = datetime.now()
-            if start_date.date() < now.date():
+                start_date = datetime.fromisoformat(date_str)
+            except ValueError:
                 start_date = now
-            
-            # Parse start time
-            try:
-                hours, minutes = map(int, start_time.split(":"))
-                start_date = start_date.replace(hour=hours, minute=minutes, second=0, microsecond=0)
-            except (ValueError, TypeError):
-                start_date = start_date.replace(hour=9, minute=0, second=0, microsecond=0)
-            
-            # Set end time
-            if end_time:
-                try:
-                    end_hours, end_minutes = map(int, end_time.split(":"))
-                    end_date = start_date.replace(hour=end_hours, minute=end_minutes)
-                    if end_date < start_date:
-                        end_date = end_date + timedelta(days=1)
-                except (ValueError, TypeError):
-                    end_date = start_date + timedelta(hours=1)
-            else:
-                end_date = start_date + timedelta(hours=1)
-            
-            # Format datetime strings in ISO format with timezone
-            event_body["start"] = {
-                "dateTime": start_date.strftime("%Y-%m-%dT%H:%M:%S+05:30"),
-                "timeZone": "Asia/Kolkata"
-            }
-            
-            event_body["end"] = {
-                "dateTime": end_date.strftime("%Y-%m-%dT%H:%M:%S+05:30"),
-                "timeZone": "Asia/Kolkata"
-            }
-            
-            # Add conferenceData if requested
-            create_conference = event_data.get("create_conference", True)
-            if create_conference and event_data.get("location", "").lower() in ["google meet", "virtual meeting", "online"]:
-                request_id = str(uuid.uuid4())
-                event_body["conferenceData"] = {
-                    "createRequest": {
-                        "requestId": request_id,
-                        "conferenceSolutionKey": {"type": "hangoutsMeet"}
-                    }
+        
+        # Ensure start_date is not in the past
+        if start_date.date() < now.date():
+            start_date = now
+        
+        # Parse start time
+        start_clock = _parse_clock(start_time) if start_time else None
+        hours, minutes = start_clock or (9, 0)
+        start_date = start_date.replace(hour=hours, minute=minutes, second=0, microsecond=0)
+        
+        # Set end time
+        end_clock = _parse_clock(end_time) if end_time else None
+        if end_clock:
+            end_date = start_date.replace(hour=end_clock[0], minute=end_clock[1])
+            if end_date < start_date:
+                end_date = end_date + timedelta(days=1)
+        else:
+            end_date = start_date + timedelta(hours=1)
+        
+        # Format datetime strings in ISO format with timezone
+        event_body["start"] = {
+            "dateTime": start_date.isoformat(timespec="seconds") + EVENT_UTC_OFFSET,
+            "timeZone": EVENT_TIMEZONE
+        }
+        
+        event_body["end"] = {
+            "dateTime": end_date.isoformat(timespec="seconds") + EVENT_UTC_OFFSET,
+            "timeZone": EVENT_TIMEZONE
+        }
+        
+        # Add conferenceData if requested
+        location = event_data.location
+        if event_data.create_conference and location and location.lower() in VIRTUAL_LOCATIONS:
+            request_id = uuid.uuid4().hex
+            event_body["conferenceData"] = {
+                "createRequest": {
+                    "requestId": request_id,
+                    "conferenceSolutionKey": {"type": "hangoutsMeet"}
                 }
-            
-            # Add reminders
-            event_body["reminders"] = {
-                "useDefault": False,
-                "overrides": [
-                    {"method": "email", "minutes": 1440},
-                    {"method": "email", "minutes": 60},
-                    {"method": "popup", "minutes": 10}
-                ]
             }
-            
-            # Create event
-            response = requests.post(
-                f"{self.calendar_api_url}/calendars/primary/events?conferenceDataVersion=1&sendUpdates=all",
+        
+        # Add reminders
+        event_body["reminders"] = DEFAULT_REMINDERS
+        
+        return event_body
+
+    @staticmethod
+    def _event_result(created_event: dict, event_data: EventInput) -> dict:
+        """Pick the links returned to the agent out of the created event"""
+        return {
+            "id": created_event.get("id", ""),
+            "htmlLink": created_event.get("htmlLink", ""),
+            "hangoutLink": created_event.get("hangoutLink", "") if event_data.create_conference else ""
+        }
+
+    def _create_calendar_event(self, event_data: EventInput) -> dict:
+        """Create a Calendar event"""
+        event_body = self._build_event_body(event_data)
+        
+        # Get user info to set as organizer
+        try:
+            self._set_organizer(event_body, self._get_userinfo())
+        except Exception as e:
+            logger.error(f"Error getting user info: {str(e)}")
+        
+        # Create event; only the API call sits under the network-error handler
+        try:
+            response = get_session().post(
+                EVENTS_URL,
+                params=EVENT_INSERT_PARAMS,
                 headers=self.headers,
-                json=event_body
+                data=orjson.dumps(event_body)
             )
             response.raise_for_status()
-            created_event = response.json()
+            return self._event_result(orjson.loads(response.content), event_data)
             
-            return {
-                "id": created_event.get("id", ""),
-                "htmlLink": created_event.get("htmlLink", ""),
-                "hangoutLink": created_event.get("hangoutLink", "") if create_conference else ""
-            }
-            
-        except requests.exceptions.RequestException as e:
+        except RequestException as e:
             logger.error(f"Calendar API request error: {str(e)}")
-            logger.error(f"Request body: {json.dumps(event_body, indent=2)}")
+            # Dumping the whole body is only worth it when debugging
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Request body: {orjson.dumps(event_body, option=orjson.OPT_INDENT_2).decode()}")
             raise
+
+    async def _acreate_calendar_event(self, event_data: EventInput) -> dict:
+        """Create a Calendar event without blocking the event loop"""
+        event_body = self._build_event_body(event_data)
+        
+        # Get user info to set as organizer
+        try:
+            self._set_organizer(event_body, await self._aget_userinfo())
         except Exception as e:
-            logger.error(f"Error creating calendar event: {str(e)}")
+            logger.error(f"Error getting user info: {str(e)}")
+        
+        # Create event; only the API call sits under the network-error handler
+        try:
+            response = await send_with_retry(
+                "POST",
+                EVENTS_URL,
+                params=EVENT_INSERT_PARAMS,
+                headers=self.headers,
+                content=orjson.dumps(event_body),
+                timeout=15.0
+            )
+            response.raise_for_status()
+            return self._event_result(orjson.loads(response.content), event_data)
+            
+        except httpx.HTTPError as e:
+            logger.error(f"Calendar API request error: {str(e)}")
+            # Dumping the whole body is only worth it when debugging
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Request body: {orjson.dumps(event_body, option=orjson.OPT_INDENT_2).decode()}")
             raise
 
+    @staticmethod
+    def _format_result(event_data: EventInput, calendar_event: dict) -> str:
+        """Build the JSON reply for the agent from the input and the created event"""
+        if calendar_event and calendar_event.get("htmlLink"):
+            # Prepare response with all the details used to create the event
+            title = event_data.summary
+            response_data = {
+                "success": True,
+                "message": f"Event '{title}' created successfully",
+                "event": {
+                    "title": title,
+                    "description": event_data.description,
+                    "location": event_data.location or "",
+                    "start_time": event_data.start_time or "",
+                    "end_time": event_data.end_time or "",
+                    "due": event_data.due or "",
+                    "attendees": event_data.attendees,
+                    "calendar_link": calendar_event["htmlLink"]
+                }
+            }
+            
+            # Add hangout link if available
+            if calendar_event.get("hangoutLink"):
+                response_data["event"]["hangout_link"] = calendar_event["hangoutLink"]
+            
+            # Add recurrence info if available
+            if event_data.recurrence or event_data.repeat:
+                response_data["event"]["recurrence"] = event_data.recurrence or event_data.repeat
+            
+            # Add reminders if available
+            if event_data.reminders is not None:
+                response_data["event"]["reminders"] = event_data.reminders
+            
+            return orjson.dumps(response_data).decode()
+        else:
+            return CREATE_FAILED_RESPONSE
+
     def _run(self, query: str) -> str:
         """Execute the event creation"""
         try:
-            # Parse input
-            event_data = json.loads(query)
-            
-            # Validate required fields
-            if not event_data.get("summary") and not event_data.get("title"):
-                return json.dumps({
-                    "success": False,
-                    "error": "Event title/summary is required"
-                })
+            # Parse and validate input in one pass
+            event_data = EventInput.model_validate_json(query)
+            if not event_data.summary:
+                return MISSING_TITLE_RESPONSE
             
             # Create calendar event
             calendar_event = self._create_calendar_event(event_data)
+            return self._format_result(event_data, calendar_event)
             
-            if calendar_event and calendar_event.get("htmlLink"):
-                # Prepare response with all the details used to create the event
-                title = event_data.get("summary", event_data.get("title", "New Event"))
-                response_data = {
-                    "success": True,
-                    "message": f"Event '{title}' created successfully",
-                    "event": {
-                        "title": title,
-                        "description": event_data.get("description", event_data.get("notes", "")),
-                        "location": event_data.get("location", ""),
-                        "start_time": event_data.get("start_time", ""),
-                        "end_time": event_data.get("end_time", ""),
-                        "due": event_data.get("due", ""),
-                        "attendees": event_data.get("attendees", []),
-                        "calendar_link": calendar_event["htmlLink"]
-                    }
-                }
-                
-                # Add hangout link if available
-                if calendar_event.get("hangoutLink"):
-                    response_data["event"]["hangout_link"] = calendar_event["hangoutLink"]
-                
-                # Add recurrence info if available
-                if "recurrence" in event_data or "repeat" in event_data:
-                    response_data["event"]["recurrence"] = event_data.get("recurrence", None) or event_data.get("repeat", None)
-                
-                # Add reminders if available
-                if "reminders" in event_data:
-                    response_data["event"]["reminders"] = event_data["reminders"]
-                
-                return json.dumps(response_data)
-            else:
-                return json.dumps({
-                    "success": False,
-                    "error": "Failed to create calendar event"
-                })
-            
-        except json.JSONDecodeError:
-            logger.error("Invalid JSON input")
-            return json.dumps({
-                "success": False,
-                "error": "Invalid event data format"
-            })
+        except ValidationError as e:
+            logger.error(f"Invalid event input: {str(e)}")
+            return INVALID_INPUT_RESPONSE
         except Exception as e:
             logger.error(f"Error creating event: {str(e)}")
-            return json.dumps({
+            return orjson.dumps({
                 "success": False,
                 "error": str(e)
-            })
+            }).decode()
     
     async def _arun(self, query: str) -> str:
         """Execute the event creation asynchronously"""
-        return self._run(query) 
\ No newline at end of file
+        try:
+            # Parse and validate input in one pass
+            event_data = EventInput.model_validate_json(query)
+            if not event_data.summary:
+                return MISSING_TITLE_RESPONSE
+            
+            # Create calendar event
+            calendar_event = await self._acreate_calendar_event(event_data)
+            return self._format_result(event_data, calendar_event)
+            
+        except ValidationError as e:
+            logger.error(f"Invalid event input: {str(e)}")
+            return INVALID_INPUT_RESPONSE
+        except Exception as e:
+            logger.error(f"Error creating event: {str(e)}")
+            return orjson.dumps({
+                "success": False,
+                "error": str(e)
+            }).decode()
\ No newline at end of file
@@ -1,12 +1,53 @@
 from typing import Optional, ClassVar, Dict, Any
+from functools import lru_cache
+from collections import OrderedDict
 import logging
-import requests
-import json
+import re
+from requests.exceptions import RequestException
+import httpx
+import orjson
 from langchain.tools import BaseTool
-from datetime import datetime, timedelta
+from datetime import date as date_type, datetime, timedelta
+from src.utils.http_client import get_session, send_with_retry
+from src.utils.time_utils import RELATIVE_DAYS
+from src.utils.token_utils import token_key
 
 logger = logging.getLogger(__name__)
 
+TASK_LIST_CACHE_SIZE = 1024
+TOOL_INSTANCE_CACHE_SIZE = 256
+# Served from the same host as Calendar, so both APIs share one multiplexed HTTP/2 connection
+TASKS_API_URL = "https://www.googleapis.com/tasks/v1"
+# Endpoint URLs built once; TASKS_URL(list_id) fills in the task list
+TASK_LISTS_URL = TASKS_API_URL + "/users/@me/lists"
+TASKS_URL = (TASKS_API_URL + "/lists/{}/tasks").format
+# Only the first list's id is used, so the lookup asks for nothing else
+FIRST_LIST_PARAMS = {"maxResults": 1, "fields": "items/id"}
+
+# Fixed error replies, serialized once
+MISSING_TITLE_RESPONSE = orjson.dumps({"success": False, "error": "Task title is required"}).decode()
+INVALID_INPUT_RESPONSE = orjson.dumps({"success": False, "error": "Invalid task data format"}).decode()
+
+# Tasks are always due at 10:00 AM; appended to a YYYY-MM-DD date to form the RFC 3339 timestamp
+DUE_TIME_SUFFIX = "T10:00:00.000Z"
+# An absolute "due" value; relative ones come from RELATIVE_DAYS
+DUE_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+@lru_cache(maxsize=8)
+def _relative_due(today: date_type, offset: int) -> str:
+    """RFC 3339 due timestamp for a day offset from today; cached per calendar day"""
+    return (today + timedelta(days=offset)).isoformat() + DUE_TIME_SUFFIX
+
+def _is_utc_timestamp(due: str) -> bool:
+    """True for a full timestamp _format_due_datetime can pass on: UTC with a Z, or without an offset"""
+    if "T" not in due:
+        return False
+    try:
+        parsed = datetime.fromisoformat(due[:-1] + "+00:00" if due.endswith("Z") else due)
+    except ValueError:
+        return False
+    return parsed.tzinfo is None or due.endswith("Z")
+
 class CreateTaskTool(BaseTool):
     """Tool for creating tasks in Google Tasks"""
     name: ClassVar[str] = "create_task"
@@ -25,23 +66,44 @@ class CreateTaskTool(BaseTool):
     This would create a task with due date "2025-03-21T10:00:00.000Z" (default time is 10:00 AM).
     """
     access_token: str
-    api_url: str = "https://tasks.googleapis.com/tasks/v1"
+    api_url: ClassVar[str] = TASKS_API_URL
     headers: dict = None
+    # Token hash -> default task list id, so only the first task per user looks the list up
+    _task_list_ids: ClassVar["OrderedDict[str, str]"] = OrderedDict()
+    # Token hash -> tool, so a chat turn reuses the tool built for the same user
+    _instances: ClassVar["OrderedDict[str, CreateTaskTool]"] = OrderedDict()
     
     def __init__(self, access_token: str):
         super().__init__(access_token=access_token)
-        self.api_url = "https://tasks.googleapis.com/tasks/v1"
         self.headers = {
             "Authorization": f"Bearer {access_token}",
             "Content-Type": "application/json"
         }
     
-    def _format_due_datetime(self, due: str) -> str:
-        """Format the due date to Google Tasks API format (RFC 3339 timestamp) with fixed 10:00 AM time"""
-        if due.lower() == "today":
-            date = datetime.now()
-        elif due.lower() == "tomorrow":
-            date = datetime.now() + timedelta(days=1)
+    @classmethod
+    def get_instance(cls, access_token: str) -> "CreateTaskTool":
+        """Return the cached tool for an access token, creating it on first use"""
+        key = token_key(access_token)
+        tool = cls._instances.get(key)
+        if tool is None:
+            tool = cls(access_token)
+            cls._instances[key] = tool
+            if len(cls._instances) > TOOL_INSTANCE_CACHE_SIZE:
+                cls._instances.popitem(last=False)
+        else:
+            cls._instances.move_to_end(key)
+        return tool
+    
+    def _format_due_datetime(self, due: str, now: Optional[datetime] = None) -> str:
+        """
+        Format the due date to Google Tasks API format (RFC 3339 timestamp) with fixed 10:00 AM time.
+        Callers formatting many dates pass `now` so the clock is read once.
+        """
+        now = now or datetime.now()
+        offset = RELATIVE_DAYS.get(due.lower())
+        if offset is not None:
+            # The date is part of the key, so a cached "today" never outlives its day
+            return _relative_due(now.date(), offset)
         else:
             try:
                 # Try to parse the date in various formats
@@ -53,127 +115,248 @@ class CreateTaskTool(BaseTool):
                     return f"{due}Z"
                 else:
                     # Just a date string
-                    date = datetime.strptime(due, "%Y-%m-%d")
+                    date = datetime.fromisoformat(due)
             except ValueError:
                 # If can't parse, use default format with current date
                 logger.warning(f"Could not parse date: {due}, using today with default time")
-                date = datetime.now()
+                date = now
 
-        # Always use 10:00 AM time
-        date = date.replace(hour=10, minute=0, second=0, microsecond=0)
-
-        # Format according to RFC 3339 timestamp format required by Google Tasks
+        # Format according to RFC 3339 timestamp format required by Google Tasks, always at 10:00 AM
         # Format: YYYY-MM-DDTHH:MM:SS.000Z
-        rfc3339_format = f"{date.strftime('%Y-%m-%d')}T10:00:00.000Z"
+        rfc3339_format = date.date().isoformat() + DUE_TIME_SUFFIX
         logger.info(f"Formatted date to RFC 3339: {rfc3339_format}")
         return rfc3339_format
 
+    def _cached_task_list_id(self) -> Optional[str]:
+        """Return the remembered default task list id for this token, if any"""
+        key = token_key(self.access_token)
+        task_list_id = self._task_list_ids.get(key)
+        if task_list_id is not None:
+            self._task_list_ids.move_to_end(key)
+        return task_list_id
+    
+    def _store_task_list_id(self, task_list_id: str) -> str:
+        """Remember the default task list id for this token, evicting the least recently used one"""
+        self._task_list_ids[token_key(self.access_token)] = task_list_id
+        if len(self._task_list_ids) > TASK_LIST_CACHE_SIZE:
+            self._task_list_ids.popitem(last=False)
+        return task_list_id
+    
+    def _forget_task_list_id(self) -> None:
+        """Drop the remembered list id, e.g. after the user deleted that list"""
+        self._task_list_ids.pop(token_key(self.access_token), None)
+    
+    def _get_task_list_id(self) -> str:
+        """Return the id of the user's first task list, creating one if there is none"""
+        task_list_id = self._cached_task_list_id()
+        if task_list_id is not None:
+            return task_list_id
+        
+        lists_response = get_session().get(TASK_LISTS_URL, params=FIRST_LIST_PARAMS, headers=self.headers)
+        lists_response.raise_for_status()
+        task_lists = orjson.loads(lists_response.content).get("items", [])
+        
+        if task_lists:
+            return self._store_task_list_id(task_lists[0]["id"])
+        
+        # Create default task list
+        create_list_response = get_session().post(
+            TASK_LISTS_URL,
+            headers=self.headers,
+            data=orjson.dumps({"title": "AI Assistant Tasks"})
+        )
+        create_list_response.raise_for_status()
+        return self._store_task_list_id(orjson.loads(create_list_response.content)["id"])
+    
+    async def _aget_task_list_id(self) -> str:
+        """Async version of the task list lookup"""
+        task_list_id = self._cached_task_list_id()
+        if task_list_id is not None:
+            return task_list_id
+        
+        lists_response = await send_with_retry("GET", TASK_LISTS_URL, params=FIRST_LIST_PARAMS, headers=self.headers, timeout=15.0)
+        lists_response.raise_for_status()
+        task_lists = orjson.loads(lists_response.content).get("items", [])
+        
+        if task_lists:
+            return self._store_task_list_id(task_lists[0]["id"])
+        
+        # Create default task list
+        create_list_response = await send_with_retry(
+            "POST",
+            TASK_LISTS_URL,
+            headers=self.headers,
+            content=orjson.dumps({"title": "AI Assistant Tasks"}),
+            timeout=15.0
+        )
+        create_list_response.raise_for_status()
+        return self._store_task_list_id(orjson.loads(create_list_response.content)["id"])
+    
+    def _insert_task(self, task_body: dict) -> dict:
+        """
+        Create the task in the default list and return the created task.
+        A 404 on a remembered list id means the list was deleted, so it is looked up again once.
+        """
+        was_cached = self._cached_task_list_id() is not None
+        while True:
+            task_list_id = self._get_task_list_id()
+            create_response = get_session().post(
+                TASKS_URL(task_list_id),
+                headers=self.headers,
+                data=orjson.dumps(task_body)
+            )
+            if create_response.status_code == 404:
+                self._forget_task_list_id()
+                if was_cached:
+                    was_cached = False
+                    continue
+            create_response.raise_for_status()
+            return orjson.loads(create_response.content)
+    
+    async def _ainsert_task(self, task_body: dict) -> dict:
+        """Async version of the task insert, with the same stale list id retry"""
+        was_cached = self._cached_task_list_id() is not None
+        while True:
+            task_list_id = await self._aget_task_list_id()
+            create_response = await send_with_retry(
+                "POST",
+                TASKS_URL(task_list_id),
+                headers=self.headers,
+                content=orjson.dumps(task_body),
+                timeout=15.0
+            )
+            if create_response.status_code == 404:
+                self._forget_task_list_id()
+                if was_cached:
+                    was_cached = False
+                    continue
+            create_response.raise_for_status()
+            return orjson.loads(create_response.content)
+    
+    @staticmethod
+    def _validate(task_data: Any) -> Optional[str]:
+        """Return the error reply for input the API would reject, or None; checked before any HTTP call"""
+        if not isinstance(task_data, dict):
+            return INVALID_INPUT_RESPONSE
+        if not task_data.get("title"):
+            logger.warning("Task title is missing")
+            return MISSING_TITLE_RESPONSE
+        if "due" in task_data:
+            due = task_data["due"]
+            if not (isinstance(due, str) and (due.lower() in RELATIVE_DAYS or DUE_DATE_RE.match(due) or _is_utc_timestamp(due))):
+                logger.warning(f"Invalid due date: {due}")
+                return orjson.dumps({
+                    "success": False,
+                    "error": f"Invalid due date '{due}': use \"today\", \"tomorrow\", YYYY-MM-DD or YYYY-MM-DDTHH:MM:SSZ"
+                }).decode()
+        return None
+    
+    def _build_task_body(self, task_data: dict, now: Optional[datetime] = None) -> dict:
+        """Build the Tasks API request body from the tool input, without any I/O"""
+        task_body = {
+            "title": task_data["title"],
+            "status": "needsAction"
+        }
+        
+        # Handle due date (always with 10:00 AM time)
+        if "due" in task_data:
+            due_date = self._format_due_datetime(task_data["due"], now)
+            task_body["due"] = due_date
+            logger.info(f"Formatted due date: {due_date}")
+        
+        # Handle notes
+        if "notes" in task_data:
+            task_body["notes"] = task_data["notes"]
+        
+        # Log the final task body for debugging
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Final task_body: {orjson.dumps(task_body).decode()}")
+        
+        return task_body
+    
+    @staticmethod
+    def _format_result(original_title: str, created_task: dict, task_body: dict) -> str:
+        """Build the JSON reply for the agent from the created task"""
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Task created successfully: {orjson.dumps(created_task).decode()}")
+        return orjson.dumps({
+            "success": True,
+            "message": f"Task '{original_title}' created successfully",
+            "task": {
+                "title": created_task.get("title"),
+                "due": created_task.get("due"),
+                "notes": created_task.get("notes"),
+                "status": created_task.get("status")
+            },
+            "request_details": {
+                "due": task_body.get("due")
+            }
+        }).decode()
+
     def _run(self, query: str) -> str:
         """Execute the task creation"""
         try:
             # Parse input
-            task_data = json.loads(query)
-            logger.info(f"Received task data: {json.dumps(task_data, indent=2)}")
-            
-            # Validate and set defaults
-            if not task_data.get("title"):
-                logger.warning("Task title is missing")
-                return json.dumps({
-                    "success": False,
-                    "error": "Task title is required"
-                })
-            
-            # Get or create default task list
-            lists_response = requests.get(f"{self.api_url}/users/@me/lists", headers=self.headers)
-            lists_response.raise_for_status()
-            task_lists = lists_response.json().get("items", [])
-            
-            if not task_lists:
-                # Create default task list
-                create_list_response = requests.post(
-                    f"{self.api_url}/users/@me/lists",
-                    headers=self.headers,
-                    json={"title": "AI Assistant Tasks"}
-                )
-                create_list_response.raise_for_status()
-                task_list_id = create_list_response.json()["id"]
-            else:
-                task_list_id = task_lists[0]["id"]
-            
-            # Prepare task data for Google Tasks
-            original_title = task_data["title"]
-            
-            # Build task body
-            task_body = {
-                "title": task_data["title"],
-                "status": "needsAction"
-            }
-            
-            # Handle due date (always with 10:00 AM time)
-            if "due" in task_data:
-                due_date = self._format_due_datetime(task_data["due"])
-                task_body["due"] = due_date
-                logger.info(f"Formatted due date: {due_date}")
-            
-            # Handle notes
-            if "notes" in task_data:
-                task_body["notes"] = task_data["notes"]
-            
-            # Log the final task body for debugging
-            logger.info(f"Final task_body: {json.dumps(task_body, indent=2)}")
-            
-            # Verify essential fields
-            if "due" in task_body:
-                if not (task_body["due"].endswith("Z") and "T" in task_body["due"]):
-                    logger.warning(f"Due date may not be properly formatted: {task_body['due']}")
-                    # Fix the format if needed
-                    if not "T" in task_body["due"]:
-                        task_body["due"] = f"{task_body['due']}T10:00:00.000Z"
-            
-            # Create task
-            create_response = requests.post(
-                f"{self.api_url}/lists/{task_list_id}/tasks",
-                headers=self.headers,
-                json=task_body
-            )
-            create_response.raise_for_status()
+            task_data = orjson.loads(query)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"Received task data: {orjson.dumps(task_data).decode()}")
             
-            created_task = create_response.json()
-            logger.info(f"Task created successfully: {json.dumps(created_task, indent=2)}")
+            # Validate before the task list lookup, so bad input costs no round-trip
+            error_reply = self._validate(task_data)
+            if error_reply is not None:
+                return error_reply
             
-            return json.dumps({
-                "success": True,
-                "message": f"Task '{original_title}' created successfully",
-                "task": {
-                    "title": created_task.get("title"),
-                    "due": created_task.get("due"),
-                    "notes": created_task.get("notes"),
-                    "status": created_task.get("status")
-                },
-                "request_details": {
-                    "due": task_body.get("due")
-                }
-            })
+            # Create task in the default task list
+            task_body = self._build_task_body(task_data)
+            created_task = self._insert_task(task_body)
+            return self._format_result(task_data["title"], created_task, task_body)
             
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             logger.error("Invalid JSON input")
-            return json.dumps({
-                "success": False,
-                "error": "Invalid task data format"
-            })
-        except requests.exceptions.RequestException as e:
+            return INVALID_INPUT_RESPONSE
+        except RequestException as e:
             logger.error(f"API request error: {str(e)}")
-            return json.dumps({
+            return orjson.dumps({
                 "success": False,
                 "error": f"Failed to communicate with API: {str(e)}"
-            })
+            }).decode()
         except Exception as e:
             logger.error(f"Error creating task: {str(e)}")
-            return json.dumps({
+            return orjson.dumps({
                 "success": False,
                 "error": str(e)
-            })
+            }).decode()
     
     async def _arun(self, query: str) -> str:
         """Execute the task creation asynchronously"""
-        return self._run(query) 
\ No newline at end of file
+        try:
+            # Parse input
+            task_data = orjson.loads(query)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"Received task data: {orjson.dumps(task_data).decode()}")
+            
+            # Validate before the task list lookup, so bad input costs no round-trip
+            error_reply = self._validate(task_data)
+            if error_reply is not None:
+                return error_reply
+            
+            # Create task in the default task list
+            task_body = self._build_task_body(task_data)
+            created_task = await self._ainsert_task(task_body)
+            return self._format_result(task_data["title"], created_task, task_body)
+            
+        except orjson.JSONDecodeError:
+            logger.error("Invalid JSON input")
+            return INVALID_INPUT_RESPONSE
+        except httpx.HTTPError as e:
+            logger.error(f"API request error: {str(e)}")
+            return orjson.dumps({
+                "success": False,
+                "error": f"Failed to communicate with API: {str(e)}"
+            }).decode()
+        except Exception as e:
+            logger.error(f"Error creating task: {str(e)}")
+            return orjson.dumps({
+                "success": False,
+                "error": str(e)
+            }).decode()
\ No newline at end of file
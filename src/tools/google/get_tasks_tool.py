@@ -1,12 +1,26 @@
 from typing import Optional, ClassVar
 import logging
-import requests
-import json
+import orjson
 from langchain.tools import BaseTool
 from datetime import datetime, timedelta
+from src.utils.http_client import get_session, send_with_retry
 
 logger = logging.getLogger(__name__)
 
+# Served from the same host as Calendar, so both APIs share one multiplexed HTTP/2 connection
+TASKS_API_URL = "https://www.googleapis.com/tasks/v1"
+# Endpoint URLs built once; TASKS_URL(list_id) fills in the task list
+TASK_LISTS_URL = TASKS_API_URL + "/users/@me/lists"
+TASKS_URL = (TASKS_API_URL + "/lists/{}/tasks").format
+# Only the first list is read, so the lookup asks for just its id and title
+FIRST_LIST_PARAMS = {"maxResults": 1, "fields": "items(id,title)"}
+
+NO_TASK_LISTS_RESPONSE = orjson.dumps({
+    "success": True,
+    "message": "No task lists found",
+    "tasks": []
+}).decode()
+
 class GetTasksTool(BaseTool):
     """Tool for getting tasks from Google Tasks"""
     name: ClassVar[str] = "get_tasks"
@@ -18,85 +32,110 @@ class GetTasksTool(BaseTool):
     Example: {"today_only": true} or {"tomorrow_only": true}
     """
     access_token: str
-    api_url: str = "https://tasks.googleapis.com/tasks/v1"
+    api_url: ClassVar[str] = TASKS_API_URL
     headers: Optional[dict] = None
     
     def __init__(self, access_token: str):
         super().__init__(access_token=access_token)
-        self.api_url = "https://tasks.googleapis.com/tasks/v1"
         self.headers = {
             "Authorization": f"Bearer {access_token}",
             "Content-Type": "application/json"
         }
     
+    @staticmethod
+    def _filter_date(query: str) -> Optional[str]:
+        """Return the YYYY-MM-DD day to filter tasks by, or None for all tasks"""
+        params = orjson.loads(query) if query else {}
+        today_only = params.get("today_only", False)
+        tomorrow_only = params.get("tomorrow_only", False)
+        if not (today_only or tomorrow_only):
+            return None
+        
+        # Only the requested day is formatted, from a single clock read
+        now = datetime.now()
+        filter_day = now if today_only else now + timedelta(days=1)  # else: tomorrow_only
+        return filter_day.strftime("%Y-%m-%d")
+    
+    @staticmethod
+    def _format_tasks(task_list: dict, tasks: list, filter_date: Optional[str]) -> str:
+        """Filter the tasks to the requested day and format them for display"""
+        if filter_date:
+            tasks = [
+                task for task in tasks 
+                if task.get("due") and task.get("due").startswith(filter_date)
+            ]
+        
+        # Format tasks for display
+        formatted_tasks = []
+        for task in tasks:
+            formatted_task = {
+                "title": task.get("title"),
+                "status": task.get("status", "needsAction"),
+                "due": task.get("due"),
+                "notes": task.get("notes")
+            }
+            formatted_tasks.append(formatted_task)
+        
+        return orjson.dumps({
+            "success": True,
+            "task_list": task_list["title"],
+            "tasks": formatted_tasks
+        }).decode()
+    
     def _run(self, query: str) -> str:
         """Execute the task retrieval"""
         try:
-            # Parse input
-            params = json.loads(query) if query else {}
-            today_only = params.get("today_only", False)
-            tomorrow_only = params.get("tomorrow_only", False)
+            filter_date = self._filter_date(query)
             
             # Get task lists
-            lists_response = requests.get(f"{self.api_url}/users/@me/lists", headers=self.headers)
+            lists_response = get_session().get(TASK_LISTS_URL, params=FIRST_LIST_PARAMS, headers=self.headers)
             lists_response.raise_for_status()
-            task_lists = lists_response.json().get("items", [])
+            task_lists = orjson.loads(lists_response.content).get("items", [])
             
             if not task_lists:
-                return json.dumps({
-                    "success": True,
-                    "message": "No task lists found",
-                    "tasks": []
-                })
+                return NO_TASK_LISTS_RESPONSE
             
             # Get tasks from first list
-            task_list_id = task_lists[0]["id"]
-            tasks_response = requests.get(
-                f"{self.api_url}/lists/{task_list_id}/tasks",
+            tasks_response = get_session().get(
+                TASKS_URL(task_lists[0]["id"]),
                 headers=self.headers
             )
             tasks_response.raise_for_status()
-            tasks = tasks_response.json().get("items", [])
-            
-            # Filter for today's or tomorrow's tasks if requested
-            if today_only or tomorrow_only:
-                today = datetime.now().strftime("%Y-%m-%d")
-                tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
-                
-                if today_only:
-                    filter_date = today
-                else:  # tomorrow_only
-                    filter_date = tomorrow
-                
-                tasks = [
-                    task for task in tasks 
-                    if task.get("due") and task.get("due").startswith(filter_date)
-                ]
-            
-            # Format tasks for display
-            formatted_tasks = []
-            for task in tasks:
-                formatted_task = {
-                    "title": task.get("title"),
-                    "status": task.get("status", "needsAction"),
-                    "due": task.get("due"),
-                    "notes": task.get("notes")
-                }
-                formatted_tasks.append(formatted_task)
-            
-            return json.dumps({
-                "success": True,
-                "task_list": task_lists[0]["title"],
-                "tasks": formatted_tasks
-            })
-            
+            return self._format_tasks(task_lists[0], orjson.loads(tasks_response.content).get("items", []), filter_date)
+        
         except Exception as e:
             logger.error(f"Error getting tasks: {str(e)}")
-            return json.dumps({
+            return orjson.dumps({
                 "success": False,
                 "error": str(e)
-            })
+            }).decode()
     
     async def _arun(self, query: str) -> str:
         """Execute the task retrieval asynchronously"""
-        return self._run(query) 
\ No newline at end of file
+        try:
+            filter_date = self._filter_date(query)
+            
+            # Get task lists
+            lists_response = await send_with_retry("GET", TASK_LISTS_URL, params=FIRST_LIST_PARAMS, headers=self.headers, timeout=15.0)
+            lists_response.raise_for_status()
+            task_lists = orjson.loads(lists_response.content).get("items", [])
+            
+            if not task_lists:
+                return NO_TASK_LISTS_RESPONSE
+            
+            # Get tasks from first list
+            tasks_response = await send_with_retry(
+                "GET",
+                TASKS_URL(task_lists[0]["id"]),
+                headers=self.headers,
+                timeout=15.0
+            )
+            tasks_response.raise_for_status()
+            return self._format_tasks(task_lists[0], orjson.loads(tasks_response.content).get("items", []), filter_date)
+        
+        except Exception as e:
+            logger.error(f"Error getting tasks: {str(e)}")
+            return orjson.dumps({
+                "success": False,
+                "error": str(e)
+            }).decode()
\ No newline at end of file
@@ -1,8 +1,15 @@
 import json
+import time
+import asyncio
+from collections import OrderedDict
 from langchain.tools import BaseTool
-from typing import ClassVar, Dict
+from typing import ClassVar, Dict, Tuple
 import httpx
 import os
+from src.utils.http_client import get_async_client
+
+# Upper bound on cached city lookups; the least recently used one is evicted first
+WEATHER_CACHE_SIZE = 256
 
 class WeatherService:
 
@@ -12,23 +19,59 @@ class WeatherService:
             raise ValueError("WEATHER_API_KEY not found in environment variables")
 
         self.base_url = os.getenv("WEATHER_API_URL")
+        # Parameters shared by every request; only the city and overrides change per call
+        self._base_params = {"appid": self.api_key, "units": "metric", "lang": "en"}
+        
+        # Weather changes slowly, so recent answers are reused and concurrent misses share one call
+        self._ttl = 300.0
+        self._cache: "OrderedDict[Tuple[str, str, str], Tuple[float, Dict]]" = OrderedDict()
+        self._in_flight: Dict[Tuple[str, str, str], asyncio.Future] = {}
 
     async def get_weather_by_city(self, city: str, units: str = "metric", lang: str = "en") -> Dict:
+        # Clean the city input
+        clean_city = city.strip().replace('\n', '').replace('\r', '')
+        key = (clean_city.lower(), units, lang)
+        
+        cached = self._cache.get(key)
+        if cached:
+            if time.monotonic() - cached[0] < self._ttl:
+                self._cache.move_to_end(key)
+                return cached[1]
+            del self._cache[key]
+        
+        # Another request is already fetching this city; wait for its result
+        if key in self._in_flight:
+            return await asyncio.shield(self._in_flight[key])
+        
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
         try:
-            # Clean the city input
-            clean_city = city.strip().replace('\n', '').replace('\r', '')
-            
-            params = {
-                "q": clean_city,
-                "appid": self.api_key,
-                "units": units,
-                "lang": lang
-            }
+            data = await self._fetch_weather(clean_city, units, lang)
+            self._cache[key] = (time.monotonic(), data)
+            self._cache.move_to_end(key)
+            if len(self._cache) > WEATHER_CACHE_SIZE:
+                self._cache.popitem(last=False)
+            future.set_result(data)
+            return data
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+
+    async def _fetch_weather(self, clean_city: str, units: str, lang: str) -> Dict:
+        try:
+            params = {**self._base_params, "q": clean_city, "units": units, "lang": lang}
 
-            async with httpx.AsyncClient() as client:
-                response = await client.get(self.base_url, params=params, timeout=10.0)
-                response.raise_for_status()
-                return response.json()
+            # Pooled client, so repeat lookups reuse the keep-alive connection
+            response = await get_async_client().get(self.base_url, params=params, timeout=10.0)
+            response.raise_for_status()
+            return response.json()
 
         except httpx.HTTPError as e:
             error_msg = f"HTTP error occurred: {str(e)}"
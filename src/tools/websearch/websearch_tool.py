@@ -1,28 +1,30 @@
 import os
+import asyncio
 import requests
 from langchain.tools import BaseTool
 from typing import ClassVar
 
+# Read once at import; main.py loads .env before importing the agents
+TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
+TAVILY_API_URL = os.getenv("TAVILY_API_URL")
+
 class WebSearchTool(BaseTool):
     name: ClassVar[str] = "web_search"
     description: ClassVar[str] = "Searches the web for the latest information using Tavily AI."
 
     def _run(self, query: str) -> str:
         """Perform a web search using Tavily AI API results."""
-        api_key = os.getenv("TAVILY_API_KEY")
-        api_url = os.getenv("TAVILY_API_URL")
-
-        if not api_key or not api_url:
+        if not TAVILY_API_KEY or not TAVILY_API_URL:
             return "Error: Tavily API key or API URL is missing. Please set the environment variables."
 
         try:
             headers = {
-                "Authorization": f"Bearer {api_key}",
+                "Authorization": f"Bearer {TAVILY_API_KEY}",
                 "Content-Type": "application/json"
             }
             body = {"query": query}
 
-            response = requests.post(api_url, json=body, headers=headers)
+            response = requests.post(TAVILY_API_URL, json=body, headers=headers)
             response.raise_for_status()  # Raise an error for HTTP failures
 
             data = response.json()
@@ -52,4 +54,5 @@ class WebSearchTool(BaseTool):
 
     async def _arun(self, query: str) -> str:
         """Async version of the web search tool."""
-        return self._run(query)
+        # Run the blocking request in a worker thread so it does not stall the event loop
+        return await asyncio.to_thread(self._run, query)
@@ -0,0 +1,44 @@
+"""Per-session conversation history kept in process memory."""
+
+from collections import OrderedDict, deque
+from typing import Deque, List
+
+from langchain.schema import AIMessage, BaseMessage, HumanMessage
+
+
+class ChatHistory:
+    """
+    Recent turns per session, replayed after the static system prompt so every
+    turn of a conversation extends the same prompt prefix.
+    """
+
+    def __init__(self, max_sessions: int = 1024, max_messages: int = 50):
+        self.max_sessions = max_sessions
+        self.max_messages = max_messages
+        self._sessions: "OrderedDict[str, Deque[BaseMessage]]" = OrderedDict()
+
+    def get(self, session_id: str) -> List[BaseMessage]:
+        """Return the stored messages for a session, oldest first."""
+        messages = self._sessions.get(session_id)
+        if messages is None:
+            return []
+        self._sessions.move_to_end(session_id)
+        return list(messages)
+
+    def record(self, session_id: str, question: str, answer: str) -> None:
+        """
+        Append a completed turn to a session, dropping its oldest messages and
+        the least recently used session when the limits are exceeded.
+        """
+        messages = self._sessions.get(session_id)
+        if messages is None:
+            messages = self._sessions[session_id] = deque(maxlen=self.max_messages)
+        messages.append(HumanMessage(content=question))
+        messages.append(AIMessage(content=answer))
+        self._sessions.move_to_end(session_id)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+
+# Shared by both agents, so a session keeps its context when switching models
+chat_history = ChatHistory()
@@ -0,0 +1,95 @@
+"""Background chat jobs that run independently of the HTTP request that started them."""
+
+import asyncio
+import logging
+import time
+import uuid
+from typing import AsyncIterable, Dict, List, Optional, Set, Union
+
+logger = logging.getLogger(__name__)
+
+
+class ChatJob:
+    """Output of one background chat generation, readable while it is still running."""
+
+    def __init__(self):
+        self.job_id = uuid.uuid4().hex
+        self.chunks: List[str] = []
+        self.done = False
+        self.error: Optional[str] = None
+        self.finished_at: Optional[float] = None
+        self._changed = asyncio.Condition()
+
+    @property
+    def status(self) -> str:
+        if not self.done:
+            return "running"
+        return "failed" if self.error else "completed"
+
+    async def run(self, stream: AsyncIterable[Union[str, bytes]]) -> None:
+        """Drain the stream into the job, waking any followers on every chunk."""
+        try:
+            async for chunk in stream:
+                text = chunk.decode("utf-8") if isinstance(chunk, bytes) else chunk
+                async with self._changed:
+                    self.chunks.append(text)
+                    self._changed.notify_all()
+        except Exception as e:
+            logger.error(f"Chat job {self.job_id} failed: {str(e)}")
+            self.error = str(e)
+        finally:
+            async with self._changed:
+                self.done = True
+                self.finished_at = time.monotonic()
+                self._changed.notify_all()
+
+    async def follow(self) -> AsyncIterable[str]:
+        """Stream the job's output from the beginning, then live until it finishes."""
+        index = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: index < len(self.chunks) or self.done)
+                pending = self.chunks[index:]
+                index = len(self.chunks)
+                finished = self.done
+            if pending:
+                yield "".join(pending)
+            if finished:
+                if self.error:
+                    yield f"\n\nError: {self.error}"
+                return
+
+
+class ChatJobRegistry:
+    """In-process registry of chat jobs; finished jobs are kept for ttl seconds."""
+
+    def __init__(self, ttl: float = 600.0):
+        self.ttl = ttl
+        self._jobs: Dict[str, ChatJob] = {}
+        # Strong references so running jobs are not garbage collected
+        self._tasks: Set[asyncio.Task] = set()
+
+    def submit(self, stream: AsyncIterable[Union[str, bytes]]) -> ChatJob:
+        """Start draining a response stream in the background and return its job."""
+        self._purge_expired()
+        job = ChatJob()
+        self._jobs[job.job_id] = job
+        task = asyncio.create_task(job.run(stream))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def get(self, job_id: str) -> Optional[ChatJob]:
+        return self._jobs.get(job_id)
+
+    def _purge_expired(self) -> None:
+        now = time.monotonic()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and now - job.finished_at > self.ttl
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+chat_jobs = ChatJobRegistry()
@@ -5,7 +5,7 @@ from typing import Dict, Any
 from datetime import datetime, timedelta
 from langchain.schema import HumanMessage
 
-from src.utils.time_utils import parse_date_from_text, parse_time_range
+from src.utils.time_utils import parse_date_from_text, parse_time_range, format_task_date
 from src.utils.prompt.event_prompts import get_event_analysis_prompt
 
 logger = logging.getLogger(__name__)
@@ -105,6 +105,38 @@ def format_event_details(event_data: Dict[str, Any]) -> str:
     # Format as a single string with proper spacing
     return "\n".join(details)
 
+def format_event_line(event: Dict[str, Any], include_details: bool = True) -> str:
+    """Format a retrieved event as a single list entry for display."""
+    lines = [f"🗓️ {event.get('title', 'Untitled Event')}"]
+    
+    # Format start and end times
+    start_time = event.get("start", "")
+    if start_time:
+        formatted_start = format_task_date(start_time)
+        if event.get("is_all_day"):
+            lines.append(f"   ⏰ When: {formatted_start} (All day)")
+        else:
+            formatted_end = format_task_date(event.get("end", ""))
+            lines.append(f"   ⏰ When: {formatted_start} to {formatted_end}")
+    
+    if event.get("location"):
+        lines.append(f"   📍 Location: {event['location']}")
+    
+    if include_details and event.get("description"):
+        lines.append(f"   📝 Description: {event['description']}")
+    
+    if event.get("meet_link"):
+        lines.append(f"   🔗 Meet: {event['meet_link']}")
+    
+    if event.get("link"):
+        lines.append(f"   🌐 Calendar: {event['link']}")
+    
+    # Show attendees if present
+    if include_details and event.get("attendees"):
+        lines.append(f"   👥 Attendees: {len(event['attendees'])} people")
+    
+    return "\n".join(lines)
+
 async def prepare_event_data(content: str, llm) -> Dict[str, Any]:
     """Prepare event data from user input using AI analysis."""
     try:
@@ -125,7 +157,8 @@ async def prepare_event_data(content: str, llm) -> Dict[str, Any]:
             
             if json_match:
                 event_analysis = json.loads(json_match.group(1) if '```' in response_text else json_match.group(0))
-                logger.info(f"AI Analysis: {json.dumps(event_analysis, indent=2)}")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(f"AI Analysis: {json.dumps(event_analysis)}")
             else:
                 logger.error("No JSON found in response")
                 # Try to get a new analysis with a more specific prompt
@@ -271,7 +304,8 @@ async def prepare_event_data(content: str, llm) -> Dict[str, Any]:
                 ]
             }
         
-        logger.info(f"Prepared event data: {json.dumps(event_data, indent=2)}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Prepared event data: {json.dumps(event_data)}")
         return event_data
         
     except Exception as e:
@@ -1,41 +1,48 @@
-from typing import AsyncIterable, List
-from langchain.callbacks import AsyncIteratorCallbackHandler
+from typing import Any, AsyncIterable, List
 from langchain_openai import AzureChatOpenAI
 from langchain.schema import BaseMessage
+from langchain_core.runnables import Runnable
 import os
 from functools import lru_cache
-import asyncio
+from src.utils.http_client import get_async_client
+from src.utils.streaming import aclosing
+
+# LangChain verbose output is printed synchronously, so it stays off unless debugging
+_VERBOSE = os.getenv("AGENT_VERBOSE", "0") == "1"
+
+@lru_cache(maxsize=1)
+def get_llm() -> AzureChatOpenAI:
+    """
+    Return the process-wide Azure ChatOpenAI client.
+    It holds no per-request state, so one instance serves concurrent requests.
+    """
+    return AzureChatOpenAI(
+        openai_api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+        azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+        deployment_name=os.getenv("AZURE_DEPLOYMENT_NAME", "gpt-4o"),
+        model_name=os.getenv("AZURE_MODEL_NAME", "gpt-4o"),
+        api_version=os.getenv("AZURE_API_VERSION", "2024-02-15-preview"),
+        streaming=True,
+        verbose=_VERBOSE,
+        temperature=float(os.getenv("MODEL_TEMPERATURE", "0.7")),
+        max_tokens=int(os.getenv("MODEL_MAX_TOKENS", "4096")),
+        http_async_client=get_async_client()
+    )
 
 class BaseStreamingLLM:
     def __init__(self):
-        self.callback = AsyncIteratorCallbackHandler()
-        self.llm = self._initialize_llm()
+        self.llm = get_llm()
 
-    @lru_cache(maxsize=1)
-    def _initialize_llm(self) -> AzureChatOpenAI:
-        """Initialize Azure ChatOpenAI with cached instance"""
-        return AzureChatOpenAI(
-            openai_api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
-            deployment_name=os.getenv("AZURE_DEPLOYMENT_NAME", "gpt-4o"),
-            model_name=os.getenv("AZURE_MODEL_NAME", "gpt-4o"),
-            api_version=os.getenv("AZURE_API_VERSION", "2024-02-15-preview"),
-            streaming=True,
-            verbose=True,
-            temperature=float(os.getenv("MODEL_TEMPERATURE", "0.7")),
-            max_tokens=int(os.getenv("MODEL_MAX_TOKENS", "4096")),
-            callbacks=[self.callback]
-        )
-
-    async def stream_tokens(self) -> AsyncIterable[str]:
-        """Stream tokens from the callback handler"""
-        try:
-            async for token in self.callback.aiter():
-                yield token
-        except Exception as e:
-            yield f"Error: {str(e)}"
-        finally:
-            await self.callback.done.wait()
+    async def stream_tokens(self, runnable: Runnable, inputs: Any) -> AsyncIterable[str]:
+        """Run a runnable and stream only the per-token deltas of its chat model"""
+        # aclosing ends the upstream request as soon as the consumer stops,
+        # e.g. when the client disconnects, instead of whenever it is garbage collected
+        async with aclosing(runnable.astream_events(inputs, version="v2")) as events:
+            async for event in events:
+                if event["event"] == "on_chat_model_stream":
+                    text = event["data"]["chunk"].content
+                    if text:
+                        yield text
 
     async def generate_streaming_response(
         self, 
@@ -43,8 +50,7 @@ class BaseStreamingLLM:
     ) -> AsyncIterable[str]:
         """Generate streaming response from messages"""
         try:
-            await self.llm.agenerate([messages])
-            async for token in self.stream_tokens():
+            async for token in self.stream_tokens(self.llm, messages):
                 yield token
         except Exception as e:
-            yield f"Error: {str(e)}" 
\ No newline at end of file
+            yield f"Error: {str(e)}"
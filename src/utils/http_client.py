@@ -0,0 +1,137 @@
+"""Shared HTTP client used for outbound API calls."""
+
+import asyncio
+import logging
+import socket
+from typing import Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Disable Nagle and keep idle pooled connections alive between chat requests
+SOCKET_OPTIONS = [
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+
+# Statuses where Google rejected the call without acting on it, so even a create can be resent
+UNPROCESSED_STATUSES = frozenset((429, 503))
+
+# Retry budget shared by the sync session and send_with_retry
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 0.3
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+# Longest Retry-After the async path will wait, so a chat turn is never stalled for minutes
+RETRY_AFTER_MAX_SECONDS = 10.0
+
+_async_client: Optional[httpx.AsyncClient] = None
+_session: Optional[requests.Session] = None
+
+
+class LoggingRetry(Retry):
+    """
+    urllib3 Retry that logs every retry and also resends POSTs rejected with an
+    UNPROCESSED_STATUSES code. Retry-After is honored before each attempt.
+    """
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if method == "POST" and status_code in UNPROCESSED_STATUSES:
+            return True
+        return super().is_retry(method, status_code, has_retry_after)
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        reason = f"HTTP {response.status}" if response is not None else str(error)
+        logger.warning(f"Retrying {method} {url} after {reason} ({retry.total} retries left)")
+        return retry
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Return the process-wide AsyncClient, creating it on first use."""
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        # HTTP/2 multiplexes concurrent streaming completions over a few connections
+        limits = httpx.Limits(max_connections=32, max_keepalive_connections=32)
+        # With an explicit transport, httpx ignores client-level limits and http2, so they are set here only
+        _async_client = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(limits=limits, http2=True, socket_options=SOCKET_OPTIONS),
+            timeout=httpx.Timeout(60.0, connect=5.0),
+        )
+    return _async_client
+
+
+def get_session() -> requests.Session:
+    """
+    Return the process-wide requests Session used by the synchronous Google tools.
+    Credentials are passed per request, so connections are shared across users.
+    """
+    global _session
+    if _session is None:
+        # A timed-out create is never sent twice; POSTs are only retried on UNPROCESSED_STATUSES.
+        # The last failed response is returned rather than raised, so raise_for_status reports it.
+        retry = LoggingRetry(
+            total=RETRY_TOTAL,
+            backoff_factor=RETRY_BACKOFF_FACTOR,
+            status_forcelist=RETRY_STATUSES,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        _session = requests.Session()
+        _session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry))
+    return _session
+
+
+def _retry_delay(response: httpx.Response, attempt: int) -> float:
+    """Seconds to wait before retrying: the Retry-After header if it gives seconds, else exponential backoff"""
+    retry_after = response.headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        return min(float(retry_after), RETRY_AFTER_MAX_SECONDS)
+    return RETRY_BACKOFF_FACTOR * (2 ** attempt)
+
+
+async def send_with_retry(method: str, url: str, **kwargs) -> httpx.Response:
+    """
+    Send a request on the shared AsyncClient with the same policy as the sync session's LoggingRetry:
+    other methods are retried on RETRY_STATUSES, POSTs only on UNPROCESSED_STATUSES.
+    The last response is returned either way, so callers still use raise_for_status.
+    """
+    retry_statuses = UNPROCESSED_STATUSES if method == "POST" else RETRY_STATUSES
+    for attempt in range(RETRY_TOTAL + 1):
+        response = await get_async_client().request(method, url, **kwargs)
+        if response.status_code not in retry_statuses or attempt == RETRY_TOTAL:
+            return response
+        delay = _retry_delay(response, attempt)
+        logger.warning(
+            f"Retrying {method} {url} after HTTP {response.status_code} in {delay:.1f}s "
+            f"({RETRY_TOTAL - attempt - 1} retries left)"
+        )
+        await asyncio.sleep(delay)
+
+
+async def warm_up_connection(url: Optional[str]) -> None:
+    """
+    Open a pooled connection to a host ahead of the first real request,
+    so DNS resolution and the TLS handshake are already done.
+    """
+    if not url:
+        return
+    try:
+        await get_async_client().head(url, timeout=5.0)
+        logger.info(f"Warmed up connection to {httpx.URL(url).host}")
+    except httpx.HTTPError as e:
+        logger.warning(f"Connection warm-up failed for {url}: {str(e)}")
+
+
+async def close_async_client() -> None:
+    """Close the shared clients and release their pooled connections."""
+    global _async_client, _session
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+    if _session is not None:
+        _session.close()
+        _session = None
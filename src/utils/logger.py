@@ -1,8 +0,0 @@
-import logging
-
-# Configure basic logging
-logger = logging.getLogger(__name__)
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-) 
\ No newline at end of file
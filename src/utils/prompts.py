@@ -1,49 +1,62 @@
 """Prompt templates for various AI interactions."""
 
-from langchain_core.prompts import PromptTemplate
+from functools import lru_cache
+
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
 
 from src.utils.prompt.task_prompts import get_task_management_prompt
 
+# Separates the reasoning from the final answer in a reasoning-mode response
+REASONING_SENTINEL = "---FINAL---"
+
+@lru_cache(maxsize=1)
 def initialize_prompts():
-    """Initialize all prompt templates."""
-    cot_prompt = PromptTemplate(
-        input_variables=["question"],
-        template=(
+    """Initialize all prompt templates once; later calls return the same templates."""
+    # Static instructions live in the system message and the per-request values in
+    # the trailing human message, so every call shares the same cacheable prefix.
+    # Session history sits in between, so a conversation's prefix only ever grows.
+    # Reasoning and the final answer come back from a single call, separated by
+    # REASONING_SENTINEL, so the reasoning mode costs one round-trip instead of two.
+    reasoning_prompt = ChatPromptTemplate.from_messages([
+        ("system", (
             "You are a highly advanced reasoning assistant that harnesses the latest capabilities "
-            "from DeepSeek, OpenAI, GPT‑latest, and Glork 2. Please provide your internal chain‑of‑thought "
-            "reasoning for the following question in clear, coherent paragraphs, using the same language as the user's question. "
+            "from DeepSeek, OpenAI, GPT‑latest, and Glork 2. First provide your internal chain‑of‑thought "
+            "reasoning for the user's question in clear, coherent paragraphs, using the same language as the user's question. "
+            "Keep the reasoning proportionate to the question: a few sentences for simple questions. "
             "understand in detail the user's question and provide a detailed and factually accurate answer. "
-            "always make sure Do not include the final answer here—only your internal reasoning.\n\n"
             "always without bullet points or markdown formatting in internal reasoning"
-            "u can only use **bold** and `inline code` to highlight the keywords (no other markdown formatting is allowed)"
-            "Question: {question}\n\n"
-            "Chain-of-Thought Reasoning (in paragraphs):"
-        )
-    )
-
-    direct_prompt = PromptTemplate(
-        input_variables=["question"],
-        template=(
-            "Provide a direct, concise answer in proper markdown format with relevant emojis for: {question}\n\n"
-            "Use proper markdown formatting **bold**, *italics*, `inline code`, and other markdown elements correctly.\n\n"
-            "Answer:"
-        )
-    )
-
-    final_prompt = PromptTemplate(
-        input_variables=["chain_of_thought", "web_context"],
-        template=(
-            "Based on the following chain-of-thought reasoning and web search context (if provided), "
-            "generate a final, concise, and factually accurate answer in proper markdown format "
-            "Use proper markdown formatting **bold**, *italics*, `inline code`, and other markdown elements correctly.\n\n"
-            "with relevant emojis.\n\n"
-            "Chain-of-Thought Analysis:\n{chain_of_thought}\n\n"
-            "{web_context}\n\n"
-            "Final Answer:"
-        )
-    )
+            "u can only use **bold** and `inline code` to highlight the keywords (no other markdown formatting is allowed)\n\n"
+            f"After your reasoning, output '{REASONING_SENTINEL}' on a new line, then "
+            "a final, concise, and factually accurate answer based on the reasoning and web search context (if provided) "
+            "in proper markdown format with relevant emojis. "
+            "Use proper markdown formatting **bold**, *italics*, `inline code`, and other markdown elements correctly."
+        )),
+        MessagesPlaceholder(variable_name="history", optional=True),
+        ("human", "Question: {question}\n\nChain-of-Thought Reasoning (in paragraphs):"),
+    ])
+
+    direct_prompt = ChatPromptTemplate.from_messages([
+        ("system", (
+            "Provide a direct, concise answer in proper markdown format with relevant emojis for the user's question.\n\n"
+            "Use proper markdown formatting **bold**, *italics*, `inline code`, and other markdown elements correctly."
+        )),
+        MessagesPlaceholder(variable_name="history", optional=True),
+        ("human", "{question}\n\nAnswer:"),
+    ])
 
     task_management_prompt = get_task_management_prompt()
 
-    return cot_prompt, direct_prompt, final_prompt, task_management_prompt 
\ No newline at end of file
+    return reasoning_prompt, direct_prompt, task_management_prompt
+
+
+@lru_cache(maxsize=1)
+def get_batch_prompt() -> ChatPromptTemplate:
+    """Prompt that answers several numbered questions in one call as a JSON object."""
+    return ChatPromptTemplate.from_messages([
+        ("system", (
+            "Answer each numbered question separately with a direct, concise answer in proper markdown format. "
+            "Return a JSON object of the form {{\"answers\": [...]}} whose array holds exactly one answer string "
+            "per question, in the same order as the questions."
+        )),
+        ("human", "{questions}"),
+    ])
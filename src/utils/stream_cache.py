@@ -0,0 +1,83 @@
+"""In-memory LRU cache for replaying streamed chat responses."""
+
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from typing import AsyncIterable, List, Optional, Tuple
+
+from src.utils.streaming import aclosing
+
+# Sentence-ending punctuation that never changes what was asked
+_TRAILING_PUNCTUATION = "?!."
+
+# Queries mentioning time get a fresh answer on every request; whole words only,
+# so "sometimes" or "runtime" stay cacheable
+_UNCACHEABLE_RE = re.compile(r"\btime\b", re.IGNORECASE)
+
+
+class StreamCache:
+    """LRU cache with a TTL, mapping a request key to the encoded body of a finished stream."""
+
+    def __init__(self, maxsize: int = 256, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """
+        Casefold the query, collapse whitespace and strip trailing ?, ! and ., so near-duplicates
+        like "What is Python?" and "what is python" share a key. Other punctuation is kept,
+        since "2+2" and "2*2" or "c++" and "c#" are different questions.
+        """
+        return " ".join(query.casefold().split()).rstrip(_TRAILING_PUNCTUATION).rstrip()
+
+    @staticmethod
+    def is_cacheable(query: str) -> bool:
+        """Check whether an answer to this query may be replayed later."""
+        return _UNCACHEABLE_RE.search(query) is None
+
+    @classmethod
+    def make_key(cls, mode: str, query: str, *flags: object) -> str:
+        """Build a compact cache key from the request mode, normalized query and flags."""
+        raw = "|".join([mode, cls.normalize_query(query), *(str(flag) for flag in flags)])
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached body for a key and mark it as recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, body = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return body
+
+    def set(self, key: str, body: bytes) -> None:
+        """Store the body for a key, evicting the least recently used entry."""
+        self._entries[key] = (time.monotonic(), body)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def replay_or_record(self, key: str, stream: AsyncIterable[str]) -> AsyncIterable[bytes]:
+        """
+        Replay a cached response, or stream a fresh one and cache it.
+        The response is only stored once the stream has finished without error.
+        A replay is sent as a single chunk, so it costs one write instead of one per token.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        pending: List[bytes] = []
+        async with aclosing(stream):
+            async for chunk in stream:
+                data = chunk.encode("utf-8")
+                pending.append(data)
+                yield data
+        self.set(key, b"".join(pending))
@@ -0,0 +1,147 @@
+"""Helpers shared by the streaming chat agents."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterable, AsyncIterator, TypeVar, Union
+
+from fastapi.responses import StreamingResponse
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.types import Message, Receive, Scope, Send
+
+from src.utils.prompts import REASONING_SENTINEL
+
+T = TypeVar("T")
+
+# Section markers the frontend uses to split a reasoning-mode response
+REASONING_START = "reasoning start\n\n"
+FINAL_ANSWER_START = "\n\nFinal Answer start\n\n"
+
+# X-Accel-Buffering stops nginx-style proxies from holding tokens back until the response ends
+STREAM_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
+
+@asynccontextmanager
+async def aclosing(stream: T) -> AsyncIterator[T]:
+    """
+    contextlib.aclosing, which only exists from Python 3.10: close the async
+    generator when the block exits, even if the consumer stopped early.
+    """
+    try:
+        yield stream
+    finally:
+        await stream.aclose()
+
+
+async def split_reasoning_stream(tokens: AsyncIterable[str]) -> AsyncIterable[str]:
+    """
+    Forward a fused reasoning + answer token stream, replacing the sentinel
+    between the two parts with the final-answer marker.
+
+    A tail shorter than the sentinel is held back so a sentinel split across
+    tokens is still detected. If the stream ends without the sentinel (the model
+    ran out of tokens or ignored the instruction), the marker is still sent last
+    so the client always sees both sections.
+    """
+    holdback = len(REASONING_SENTINEL) - 1
+    buffer = ""
+    found = False
+
+    async with aclosing(tokens):
+        async for token in tokens:
+            if found:
+                yield token
+                continue
+
+            buffer += token
+            index = buffer.find(REASONING_SENTINEL)
+            if index != -1:
+                found = True
+                if buffer[:index].strip():
+                    yield buffer[:index].rstrip()
+                yield FINAL_ANSWER_START
+                answer = buffer[index + len(REASONING_SENTINEL):].lstrip()
+                if answer:
+                    yield answer
+                buffer = ""
+            elif len(buffer) > holdback:
+                yield buffer[:-holdback]
+                buffer = buffer[-holdback:]
+
+    if buffer:
+        yield buffer
+    if not found:
+        yield FINAL_ANSWER_START
+
+
+
+async def first_responding_stream(*streams: AsyncIterator[str]) -> AsyncIterable[str]:
+    """
+    Hedge several equivalent streams: forward the first one to produce a chunk
+    and close the rest. Streams that fail before their first chunk are skipped.
+    """
+    waiting = {asyncio.ensure_future(stream.__anext__()): stream for stream in streams}
+    winner, first_chunk, error = None, None, None
+    try:
+        while waiting and winner is None:
+            done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                stream = waiting.pop(task)
+                if task.exception() is None:
+                    winner, first_chunk = stream, task.result()
+                    break
+                error = task.exception()
+                await stream.aclose()
+    finally:
+        # Let the cancelled reads unwind before closing their streams
+        for task in waiting:
+            task.cancel()
+        await asyncio.gather(*waiting, return_exceptions=True)
+        for stream in waiting.values():
+            await stream.aclose()
+
+    if winner is None:
+        raise error or RuntimeError("No stream produced a response")
+
+    async with aclosing(winner):
+        yield first_chunk
+        async for chunk in winner:
+            yield chunk
+
+
+class _EventStreamPassthroughResponder(GZipResponder):
+    """GZip responder that sends text/event-stream responses through untouched."""
+
+    passthrough = False
+
+    async def send_with_gzip(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            self.passthrough = content_type.startswith("text/event-stream")
+        if self.passthrough:
+            await self.send(message)
+        else:
+            await super().send_with_gzip(message)
+
+
+class StreamingGZipMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware for the JSON endpoints that leaves streamed chat responses uncompressed,
+    so tokens are not held in the compressor until the stream ends.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("Accept-Encoding", ""):
+            responder = _EventStreamPassthroughResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+
+def streaming_response(stream: AsyncIterable[Union[str, bytes]]) -> StreamingResponse:
+    """Wrap a token stream in the raw text response the chat frontend reads."""
+    return StreamingResponse(stream, media_type="text/event-stream", headers=STREAM_HEADERS)
@@ -1,30 +1,37 @@
-"""Task-related utilities for preparing task and event data."""
+"""Task-related utilities for preparing and formatting task data."""
 
 import re
 import json
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Optional
 from datetime import datetime
 
-from .time_utils import parse_date_from_text, parse_time_range
+from .time_utils import parse_date_from_text, format_task_date
+
+# Title cleanup patterns, compiled once at import
+TITLE_TIME_RE = re.compile(
+    r'\s*at\s+\d{1,2}(?::\d{2})?\s*(?:am|pm)'  # at 2 PM
+    r'|\s*\d{1,2}(?::\d{2})?\s*(?:am|pm)'       # 2 PM
+    r'|\s*\d{2}:\d{2}',                          # 14:00
+    re.IGNORECASE
+)
+TITLE_DATE_TERMS_RE = re.compile(r'\b(?:today|tomorrow|next week|next month|next day)\b', re.IGNORECASE)
+WHITESPACE_RE = re.compile(r'\s+')
 
 def clean_title(title: str) -> str:
     """Clean task/event title by removing time information and date terms."""
+    # Substring checks skip the regexes for titles with nothing to remove
+    title_lower = title.lower()
+    
     # Remove time information
-    time_patterns = [
-        r'\s*at\s+\d{1,2}(?::\d{2})?\s*(?:am|pm)',  # at 2 PM
-        r'\s*\d{1,2}(?::\d{2})?\s*(?:am|pm)',       # 2 PM
-        r'\s*\d{2}:\d{2}'                           # 14:00
-    ]
-    for pattern in time_patterns:
-        title = re.sub(pattern, '', title, flags=re.IGNORECASE)
+    if "am" in title_lower or "pm" in title_lower or ":" in title_lower:
+        title = TITLE_TIME_RE.sub('', title)
     
     # Remove date terms
-    date_terms = ["today", "tomorrow", "next week", "next month", "next day"]
-    for term in date_terms:
-        title = re.sub(r'\b' + term + r'\b', '', title, flags=re.IGNORECASE)
+    if "today" in title_lower or "tomorrow" in title_lower or "next " in title_lower:
+        title = TITLE_DATE_TERMS_RE.sub('', title)
     
     # Cleanup any double spaces created by removals
-    return re.sub(r'\s+', ' ', title).strip()
+    return WHITESPACE_RE.sub(' ', title).strip()
 
 def extract_task_title(content: str) -> Optional[str]:
     """Extract task title from user input."""
@@ -43,39 +50,6 @@ def extract_task_title(content: str) -> Optional[str]:
     # Last resort
     return content_lower.replace("reminder", "").replace("task", "").replace("set", "").replace("create", "").strip()
 
-def extract_event_title(content: str) -> Optional[str]:
-    """Extract event title from user input."""
-    content_lower = content.lower()
-    
-    # Try event markers first
-    event_markers = ["schedule meeting for ", "create meeting for ", "set meeting for ",
-                    "schedule event for ", "create event for ", "set event for "]
-    for marker in event_markers:
-        if marker in content_lower:
-            return content_lower.split(marker, 1)[1].strip()
-    
-    # Fallback extraction
-    if "meeting about " in content_lower:
-        return content_lower.split("meeting about ", 1)[1].strip()
-    elif "event about " in content_lower:
-        return content_lower.split("event about ", 1)[1].strip()
-    
-    # Last resort
-    return content_lower.replace("meeting", "").replace("event", "").replace("schedule", "").replace("create", "").replace("set", "").strip()
-
-def extract_attendees(content: str) -> Optional[List[str]]:
-    """Extract attendees from content."""
-    content_lower = content.lower()
-    
-    if "guest list:" in content_lower:
-        attendees = content.lower().split("guest list:")[1].strip().split(",")
-        return [email.strip() for email in attendees]
-    elif "email is" in content_lower:
-        email = content.lower().split("email is")[1].strip()
-        return [email]
-    
-    return None
-
 def extract_notes(content: str) -> Optional[str]:
     """Extract notes from content."""
     if "notes:" in content.lower():
@@ -154,6 +128,19 @@ def format_task_details(task_data: Dict[str, Any]) -> str:
     
     return "\n\n".join(details)
 
+def format_task_line(task: Dict[str, Any]) -> str:
+    """Format a retrieved task as a single list entry for display."""
+    status_emoji = "✅" if task["status"] == "completed" else "⏳"
+    lines = [f"{status_emoji} {task['title']}"]
+    
+    if task.get("due"):
+        lines.append(f"   📅 Due: {format_task_date(task['due'])}")
+    
+    if task.get("notes"):
+        lines.append(f"   📝 Notes: {task['notes']}")
+    
+    return "\n".join(lines)
+
 def prepare_task_data(content: str, task_analysis: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Prepare task data from user input and optional AI analysis."""
     task_data = {}
@@ -191,34 +178,4 @@ def prepare_task_data(content: str, task_analysis: Optional[Dict[str, Any]] = No
         
         task_data["notes"] = "\n".join(notes[:3])  # Limit to 3 points
     
-    return task_data
-
-def prepare_event_data(content: str) -> Dict[str, Any]:
-    """Prepare event data from user input."""
-    event_data = {}
-    
-    # Get title
-    title = extract_event_title(content)
-    event_data["title"] = clean_title(title).title() if title else "New Event"
-    
-    # Get date
-    event_data["due"] = parse_date_from_text(content)
-    
-    # Get time range
-    start_time, end_time = parse_time_range(content)
-    if start_time:
-        event_data["start_time"] = start_time
-    if end_time:
-        event_data["end_time"] = end_time
-    
-    # Get attendees
-    attendees = extract_attendees(content)
-    if attendees:
-        event_data["attendees"] = attendees
-    
-    # Get notes
-    notes = extract_notes(content)
-    if notes:
-        event_data["notes"] = notes
-    
-    return event_data 
\ No newline at end of file
+    return task_data
\ No newline at end of file
@@ -4,85 +4,93 @@ import re
 from datetime import datetime, timedelta
 from typing import Optional, Tuple
 
+# Patterns are compiled once at import instead of being looked up on every parse
+RECURRING_RE = re.compile(r'every\s+\d+\s*(?:day|week|month)s?')
+
+# One pass finds either an ISO date or DD/MM and DD-MM with an optional year.
+# The ISO branch comes first so "2025-03-04" is not read as the DD-MM date "25-03".
+DATE_RE = re.compile(
+    r'(?P<iso>\d{4}-\d{2}-\d{2})'                                # YYYY-MM-DD
+    r'|(?P<day>\d{2})(?P<sep>[/-])(?P<month>\d{2})(?:(?P=sep)(?P<year>\d{4}))?'  # DD/MM[/YYYY] or DD-MM[-YYYY]
+)
+
+# "from 5pm to 6pm" is covered by the am/pm branch, which does not require the "from"
+TIME_RANGE_RE = re.compile(
+    r'(\d{1,2})(?::\d{2})?\s*(?:am|pm)\s*to\s*(\d{1,2})(?::\d{2})?\s*(?:am|pm)'  # 5pm to 6pm
+    r'|(\d{1,2}):(\d{2})\s*to\s*(\d{1,2}):(\d{2})'                             # 17:00 to 18:00
+)
+
+SINGLE_TIME_RE = re.compile(r'(?:at\s+)?(\d{1,2})(?::\d{2})?\s*(?:am|pm)')
+
+# Relative date keywords the Google tools accept, as a day offset from today
+RELATIVE_DAYS = {"today": 0, "tomorrow": 1}
+
 def parse_date_from_text(content: str) -> str:
     """Parse date from text and return in YYYY-MM-DD format."""
     content_lower = content.lower()
     
     # Remove recurring patterns to avoid confusion
-    content_clean = re.sub(r'every\s+\d+\s*(?:day|week|month)s?', '', content_lower)
+    content_clean = RECURRING_RE.sub('', content_lower)
+    
+    # Read the clock once; every branch below is relative to the same instant
+    now = datetime.now()
     
     # Check for relative dates
     if any(day in content_clean for day in ["tomorrow", "tmr"]):
-        return (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+        return (now + timedelta(days=1)).strftime("%Y-%m-%d")
     elif "next week" in content_clean:
-        return (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d")
+        return (now + timedelta(days=7)).strftime("%Y-%m-%d")
     elif any(day in content_clean for day in ["today", "now"]):
-        return datetime.now().strftime("%Y-%m-%d")
-    
-    # Try to find a specific date
-    date_patterns = [
-        (r'(\d{2})/(\d{2})(?:/\d{4})?', '%d/%m/%Y'),  # DD/MM or DD/MM/YYYY
-        (r'(\d{2})-(\d{2})(?:-\d{4})?', '%d-%m-%Y'),  # DD-MM or DD-MM-YYYY
-        (r'\d{4}-\d{2}-\d{2}', '%Y-%m-%d'),           # YYYY-MM-DD
-        (r'\d{2}/\d{2}/\d{4}', '%d/%m/%Y')            # DD/MM/YYYY
-    ]
+        return now.strftime("%Y-%m-%d")
     
-    for pattern, date_format in date_patterns:
-        if matches := re.search(pattern, content):
-            try:
-                if len(matches.groups()) == 2:  # DD/MM format without year
-                    day, month = matches.groups()
-                    current_year = datetime.now().year
-                    date_str = f"{day}/{month}/{current_year}"
-                    parsed_date = datetime.strptime(date_str, '%d/%m/%Y')
-                else:
-                    date_str = matches.group(0)
-                    if len(date_str.split('/')[0]) == 4:  # YYYY/MM/DD format
-                        parsed_date = datetime.strptime(date_str, '%Y/%m/%d')
-                    else:
-                        parsed_date = datetime.strptime(date_str, date_format)
-                
-                return parsed_date.strftime('%Y-%m-%d')
-            except ValueError:
-                continue
+    # Try to find a specific date (every supported format contains "/" or "-")
+    has_separator = "/" in content or "-" in content
+    for match in DATE_RE.finditer(content) if has_separator else ():
+        try:
+            if match.group('iso'):
+                parsed_date = datetime.fromisoformat(match.group('iso'))
+            else:
+                year = int(match.group('year') or now.year)
+                parsed_date = datetime(year, int(match.group('month')), int(match.group('day')))
+            
+            return parsed_date.strftime('%Y-%m-%d')
+        except ValueError:
+            continue
     
     # Default to today if no date found
-    return datetime.now().strftime("%Y-%m-%d")
+    return now.strftime("%Y-%m-%d")
 
 def parse_time_range(content: str) -> Tuple[Optional[str], Optional[str]]:
     """Parse time range from text and return start and end times in HH:MM format."""
     content_lower = content.lower()
     
-    # Time range patterns
-    time_patterns = [
-        r'(\d{1,2})(?::\d{2})?\s*(?:am|pm)\s*to\s*(\d{1,2})(?::\d{2})?\s*(?:am|pm)',  # 5pm to 6pm
-        r'(\d{1,2}):(\d{2})\s*to\s*(\d{1,2}):(\d{2})',  # 17:00 to 18:00
-        r'from\s*(\d{1,2})(?::\d{2})?\s*(?:am|pm)\s*to\s*(\d{1,2})(?::\d{2})?\s*(?:am|pm)'  # from 5pm to 6pm
-    ]
+    # Substring checks rule out most messages before any regex runs
+    has_meridiem = "am" in content_lower or "pm" in content_lower
+    if not has_meridiem and ":" not in content_lower:
+        return None, None
     
-    for pattern in time_patterns:
-        if time_match := re.search(pattern, content_lower):
-            if len(time_match.groups()) == 2:  # AM/PM format
-                start_hour, end_hour = time_match.groups()
-                
-                # Convert to 24-hour format
-                if "pm" in content_lower.split("to")[0].lower():
-                    start_hour = str(int(start_hour) + 12) if int(start_hour) < 12 else start_hour
-                if "pm" in content_lower.split("to")[1].lower():
-                    end_hour = str(int(end_hour) + 12) if int(end_hour) < 12 else end_hour
-                
-                return f"{int(start_hour):02d}:00", f"{int(end_hour):02d}:00"
-            elif len(time_match.groups()) == 4:  # 24-hour format
-                start_hour, start_min, end_hour, end_min = time_match.groups()
-                return f"{int(start_hour):02d}:{start_min}", f"{int(end_hour):02d}:{end_min}"
+    if "to" in content_lower and (time_match := TIME_RANGE_RE.search(content_lower)):
+        if time_match.group(1):  # AM/PM format
+            start_hour, end_hour = int(time_match.group(1)), int(time_match.group(2))
+            start_text, _, end_text = time_match.group(0).partition("to")
+            
+            # Convert to 24-hour format
+            if "pm" in start_text and start_hour < 12:
+                start_hour += 12
+            if "pm" in end_text and end_hour < 12:
+                end_hour += 12
+            
+            return f"{start_hour:02d}:00", f"{end_hour:02d}:00"
+        else:  # 24-hour format
+            start_hour, start_min, end_hour, end_min = time_match.group(3, 4, 5, 6)
+            return f"{int(start_hour):02d}:{start_min}", f"{int(end_hour):02d}:{end_min}"
     
     # Try to find single time and set duration to 1 hour
-    single_time_pattern = r'(?:at\s+)?(\d{1,2})(?::\d{2})?\s*(?:am|pm)'
-    if time_match := re.search(single_time_pattern, content_lower):
-        hour = time_match.group(1)
-        if "pm" in time_match.group(0).lower():
-            hour = str(int(hour) + 12) if int(hour) < 12 else hour
-        return f"{int(hour):02d}:00", f"{(int(hour) + 1):02d}:00"
+    if has_meridiem and (time_match := SINGLE_TIME_RE.search(content_lower)):
+        hour = int(time_match.group(1))
+        if "pm" in time_match.group(0) and hour < 12:
+            hour += 12
+        return f"{hour:02d}:00", f"{hour + 1:02d}:00"
     
     return None, None
 
@@ -0,0 +1,8 @@
+"""Helpers for keying per-user caches on Google access tokens."""
+
+import hashlib
+
+
+def token_key(access_token: str) -> str:
+    """Cache key for an access token, so raw tokens are never kept as dict keys."""
+    return hashlib.sha256(access_token.encode("utf-8")).hexdigest()[:32]